@@ -0,0 +1,190 @@
+# lib/batch.py
+"""Run CLI commands without prompts, for scripts and pipelines.
+
+    python lib/main.py jobs list --status pending --format jsonl
+    python lib/main.py jobs create --job-title Engineer --company Acme --date-applied 2025-01-06 --status applied
+    python lib/main.py run commands.txt
+
+A command is a command_handlers name ("list jobs") or its noun-first spelling
+("jobs list"), followed by --option value pairs that answer the prompts the
+interactive command would ask. An option with no value means yes. Listings
+stream one record per row in the chosen --format; status messages go to
+stderr so stdout stays machine-readable.
+
+`run` reads one command per line from a file (or - for stdin) and runs them all
+in this process. Blank lines and lines starting with # are skipped.
+"""
+import csv
+import json
+import os
+import shlex
+import sys
+from contextlib import redirect_stdout
+
+from cli import CLI, BatchError
+
+FORMATS = ("jsonl", "csv", "json")
+
+ALIASES = {
+    "jobs list": "list jobs",
+    "jobs create": "create job",
+    "jobs import": "import jobs",
+    "import": "import jobs",
+    "jobs update": "update job",
+    "jobs delete": "delete job",
+    "jobs by-tag": "list jobs by tag",
+    "jobs filter": "filter jobs",
+    "jobs search": "search",
+    "jobs due": "due follow-ups",
+    "companies list": "list companies",
+    "companies create": "create company",
+    "companies update": "update company",
+    "companies delete": "delete company",
+    "tags list": "list tags",
+    "tags create": "create tag",
+    "tags delete": "delete tag",
+    "tags assign": "assign tag",
+    "tags remove": "remove tag",
+    "companies top": "top companies",
+    "jobs funnel": "status report",
+    "stats rebuild": "rebuild stats",
+}
+
+# The options each command reads, so a misspelt option fails before anything runs.
+JOB_OPTIONS = ("job_title", "company", "description", "date_applied", "last_follow_up", "status")
+OPTIONS = {
+    "list jobs": ("status", "company_id", "applied_from", "applied_to", "days"),
+    "create job": JOB_OPTIONS + ("create_company", "website", "contact_info"),
+    "update job": ("job_id",) + JOB_OPTIONS,
+    "delete job": ("job_id",),
+    "import jobs": ("path", "rejects", "input_format"),
+    "export": ("path", "table", "output_format", "details"),
+    "list jobs by tag": ("tag_id",),
+    "filter jobs": ("all", "any", "none", "status", "company_id"),
+    "search": ("query", "limit"),
+    "due follow-ups": ("as_of", "limit"),
+    "top companies": ("status", "limit"),
+    "status report": ("company_id",),
+    "create company": ("name", "website", "contact_info"),
+    "update company": ("company_id", "name", "website", "contact_info"),
+    "delete company": ("company_id",),
+    "create tag": ("name", "tag_type"),
+    "delete tag": ("tag_id",),
+    "assign tag": ("job_id", "tag_id"),
+    "remove tag": ("job_id", "tag_id"),
+}
+
+
+class RecordWriter:
+    """Write dict records to a stream as JSON lines, CSV or a JSON array.
+
+    Records are written as they arrive, so a listing never holds more than one
+    row in memory. Dates and other non-JSON values are written as strings.
+    """
+
+    def __init__(self, stream, format="jsonl"):
+        if format not in FORMATS:
+            raise BatchError(f"--format must be one of: {', '.join(FORMATS)}")
+        self.stream = stream
+        self.format = format
+        self.count = 0
+        self._csv = None
+
+    def write(self, record):
+        if self.format == "csv":
+            if self._csv is None:
+                self._csv = csv.DictWriter(self.stream, fieldnames=list(record))
+                self._csv.writeheader()
+            self._csv.writerow(record)
+        elif self.format == "json":
+            self.stream.write("[\n" if self.count == 0 else ",\n")
+            self.stream.write(json.dumps(record, default=str))
+        else:
+            self.stream.write(json.dumps(record, default=str))
+            self.stream.write("\n")
+        self.count += 1
+
+    def close(self):
+        if self.format == "json":
+            self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+        self.stream.flush()
+
+
+def parse_command(words):
+    """Split ["jobs", "list", "--status", "pending"] into ("list jobs", {"status": "pending"})."""
+    names = []
+    while words and not words[0].startswith("--"):
+        names.append(words.pop(0).lower())
+    name = " ".join(names)
+    command = ALIASES.get(name, name)
+
+    options = {}
+    while words:
+        flag = words.pop(0)
+        if not flag.startswith("--") or flag == "--":
+            raise BatchError(f"unexpected argument '{flag}'")
+        key, has_value, value = flag[2:].partition("=")
+        if not has_value:
+            value = words.pop(0) if words and not words[0].startswith("--") else "yes"
+        options[key.replace("-", "_")] = value
+    return command, options
+
+
+def run_command(cli, words, stdout, default_format="jsonl"):
+    """Run one scripted command, streaming any records to stdout."""
+    command, options = parse_command(list(words))
+    if command not in cli.command_handlers:
+        raise BatchError(f"unknown command '{command}'")
+    format = options.pop("format", default_format)
+    unknown = set(options) - set(OPTIONS.get(command, ()))
+    if unknown:
+        raise BatchError(f"'{command}' does not take {', '.join('--' + key.replace('_', '-') for key in sorted(unknown))}")
+
+    writer = RecordWriter(stdout, format)
+    try:
+        with redirect_stdout(sys.stderr):
+            cli.execute(command, options, writer)
+    finally:
+        writer.close()
+
+
+def run_script(cli, lines, stdout, default_format="jsonl"):
+    """Run every command in lines, reporting failures to stderr and carrying on.
+
+    Returns the number of commands that failed.
+    """
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            run_command(cli, shlex.split(line), stdout, default_format)
+        except (BatchError, ValueError) as e:
+            failures += 1
+            print(f"line {number}: {e}", file=sys.stderr)
+    return failures
+
+
+def main(argv):
+    """Entry point for `main.py <command> [--options]` and `main.py run <file>`. Returns the exit status."""
+    cli = CLI()
+    try:
+        if argv[0] == "run":
+            extra, options = parse_command(argv[2:])
+            format = options.pop("format", "jsonl")
+            if len(argv) < 2 or extra or options:
+                raise BatchError("usage: main.py run <file | -> [--format jsonl|csv|json]")
+            if argv[1] == "-":
+                return 1 if run_script(cli, sys.stdin, sys.stdout, format) else 0
+            with open(argv[1]) as f:
+                return 1 if run_script(cli, f, sys.stdout, format) else 0
+        run_command(cli, argv, sys.stdout)
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`); silence the final flush too.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (BatchError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# lib/benchmark.py
+"""Time the model and CLI hot paths against a generated database.
+
+    python lib/benchmark.py --jobs 100000 --out results.json
+    python lib/benchmark.py --jobs 100000 --compare results.json
+
+Each benchmark reports ops/sec, p50/p99 latency and peak traced memory. Results
+can be saved as JSON, and --compare flags any benchmark whose p50 got slower
+than a saved run by more than --threshold (exit status 1).
+"""
+import argparse
+import functools
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import models
+from models.company import Company
+from models.job_application import JobApplication
+from models.tag import Tag
+from models.job_application_tag import JobApplicationTag
+from models.snapshot import JobSnapshot
+from models.identity_map import identity_map
+
+
+class Benchmarks:
+    """The benchmarks to run, each a (name, iterations, setup, operation) entry.
+
+    setup runs before every timed call and returns the arguments for it, so
+    picking random ids or clearing caches isn't counted.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.job_ids = [row[0] for row in models.CONN.execute("SELECT job_id FROM job_applications")]
+        self.company_names = [row[0] for row in models.CONN.execute("SELECT name FROM companies")]
+        self.tag_ids = [row[0] for row in models.CONN.execute("SELECT id FROM tags")]
+        self.company_id = models.CONN.execute("SELECT MIN(id) FROM companies").fetchone()[0]
+        self.title_words = sorted({
+            word.strip(",.()") for (title,) in models.CONN.execute("SELECT job_title FROM job_applications LIMIT 1000")
+            for word in title.split() if len(word.strip(",.()")) > 2
+        })
+        self._link_jobs = iter(self.job_ids)
+        self._link_tag = None
+
+    def cold(self, *args):
+        """Clear the identity map so every call hits SQLite."""
+        identity_map.clear()
+        return args
+
+    def random_job_id(self):
+        identity_map.clear()
+        return (self.rng.choice(self.job_ids),)
+
+    def random_company_name(self):
+        identity_map.clear()
+        return (self.rng.choice(self.company_names),)
+
+    def random_tag(self):
+        identity_map.clear()
+        return (Tag.find_by_id(self.rng.choice(self.tag_ids)),)
+
+    def random_title_word(self):
+        identity_map.clear()
+        return (self.rng.choice(self.title_words),)
+
+    def next_link(self):
+        if self._link_tag is None:
+            tag = Tag(name=f"benchmark {time.time_ns()}", tag_type="location")
+            tag.save()
+            self._link_tag = tag.id
+        return (next(self._link_jobs), self._link_tag)
+
+    def job_batch(self, size=1000):
+        def setup():
+            return ([
+                JobApplication(job_title="Benchmark engineer", company_id=self.company_id,
+                               description="bulk insert benchmark", date_applied="2025-01-01",
+                               last_follow_up=None, status="applied")
+                for _ in range(size)
+            ],)
+        return setup
+
+    def cli_page(self):
+        from cli import CLI
+        from rich.console import Console
+
+        cli = CLI()
+        cli.console = Console(file=io.StringIO(), width=120)
+        page = JobApplication.get_page(limit=CLI.PAGE_SIZE, view=True)
+
+        def setup():
+            cli.console.file = io.StringIO()
+            return (page,)
+        return cli.render_jobs, setup
+
+    def all(self, scale):
+        heavy = max(1, 5 * scale)
+        light = max(1, 200 * scale)
+        render_jobs, render_setup = self.cli_page()
+        snapshot = JobSnapshot.load()
+        entries = [
+            ("Company.get_all", heavy, self.cold, Company.get_all),
+            ("JobApplication.get_all", heavy, self.cold, JobApplication.get_all),
+            ("JobApplication.get_all[view]", heavy, self.cold, functools.partial(JobApplication.get_all, view=True)),
+            ("JobApplication.find_by_id", light, self.random_job_id, JobApplication.find_by_id),
+            ("Company.find_by_name", light, self.random_company_name, Company.find_by_name),
+            ("JobApplication.search", light, self.random_title_word, JobApplication.search),
+            ("Tag.job_applications", heavy * 4, self.random_tag, Tag.job_applications),
+            # One job is kept back for the extra setup() call of the tracemalloc pass.
+            ("JobApplicationTag.create", min(light, len(self.job_ids) - 1), self.next_link, JobApplicationTag.create),
+            ("JobApplication.save_many[1000]", heavy, self.job_batch(1000), JobApplication.save_many),
+            ("Company.find_top_two_companies", heavy, self.cold, Company.find_top_two_companies),
+            ("Company.top_n[10]", light, self.cold, functools.partial(Company.top_n, 10)),
+            ("JobApplication.status_funnel", light, self.cold, JobApplication.status_funnel),
+            ("JobSnapshot.load", heavy, self.cold, JobSnapshot.load),
+            ("JobSnapshot.status_counts", light, self.cold, snapshot.status_counts),
+            ("JobSnapshot.company_counts[10]", light, self.cold, functools.partial(snapshot.company_counts, 10)),
+            ("JobSnapshot.refresh", light, self.cold, snapshot.refresh),
+            ("CLI.list_jobs render", light // 4, render_setup, render_jobs),
+        ]
+        return entries
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(iterations, setup, operation):
+    """Time operation over iterations calls, then run it once more under
+    tracemalloc to find its peak memory.
+    """
+    devnull = io.StringIO()
+    samples = []
+    stdout = sys.stdout
+    try:
+        sys.stdout = devnull  # the models print on every write
+        for _ in range(iterations):
+            args = setup()
+            started = time.perf_counter()
+            operation(*args)
+            samples.append(time.perf_counter() - started)
+
+        args = setup()
+        tracemalloc.start()
+        operation(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        sys.stdout = stdout
+
+    total = sum(samples)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total if total else float("inf"),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+# Stamped into PRAGMA application_id of every generated database, so a rerun
+# can tell its own dataset apart from a real one before dropping the tables.
+BENCHMARK_APPLICATION_ID = 0x4A544243  # "JTBC"
+
+
+def is_benchmark_database(path):
+    """True if path is empty or was generated by this script."""
+    if os.path.getsize(path) == 0:
+        return True
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA application_id").fetchone()[0] == BENCHMARK_APPLICATION_ID
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+
+
+def scratch_copy(path):
+    """Copy the database at path into a temporary file and return the copy's path."""
+    copy = os.path.join(tempfile.mkdtemp(prefix="job-tracker-bench-"), "bench.db")
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(copy)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return copy
+
+
+def prepare_database(args):
+    """Point the models at args.db, generating the dataset unless it is being reused.
+
+    Regenerating drops every table, so an existing --db that this script didn't
+    create is refused unless --force is given. The benchmarks then run against a
+    scratch copy of --db, so the rows the write benchmarks commit don't grow the
+    dataset that later --reuse runs measure.
+    """
+    import seed
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="job-tracker-bench-"), "bench.db")
+    reuse = args.reuse and os.path.exists(path)
+    if not reuse and os.path.exists(path) and not args.force and not is_benchmark_database(path):
+        raise SystemExit(f"{path} is not a benchmark database; pass --force to drop its tables "
+                         f"and generate the dataset into it anyway")
+    models.configure(path=path)
+    if not reuse:
+        stdout = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            seed.drop_tables()
+            seed.create_tables()
+            seed.generate_data(companies=args.companies, jobs=args.jobs, tags=args.tags,
+                               tag_density=args.tag_density, seed=args.seed)
+            models.get_connection().execute(f"PRAGMA application_id = {BENCHMARK_APPLICATION_ID}")
+        finally:
+            sys.stdout = stdout
+    if args.db:
+        models.close()
+        models.configure(path=scratch_copy(path))
+    return path
+
+
+def compare(results, baseline, threshold):
+    """Print how each benchmark moved against baseline and return the regressions."""
+    regressions = []
+    print(f"\n{'benchmark':<34} {'baseline p50':>13} {'p50':>10} {'change':>8}")
+    for name, result in results["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<34} {'-':>13} {result['p50_ms']:>9.3f}ms {'new':>8}")
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<34} {before['p50_ms']:>11.3f}ms {result['p50_ms']:>9.3f}ms {change:>+8.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the job tracker's model and CLI hot paths.")
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--tag-density", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42, help="seed for the dataset and the random lookups")
+    parser.add_argument("--db", help="database file to generate into (default: a temporary file)")
+    parser.add_argument("--reuse", action="store_true", help="reuse --db as-is if it already exists")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate into --db even if it isn't a database this script created")
+    parser.add_argument("--scale", type=int, default=1, help="multiply every benchmark's iteration count")
+    parser.add_argument("--only", action="append", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="flag benchmarks whose p50 is this fraction slower than --compare (default 0.20)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    path = prepare_database(args)
+    benchmarks = Benchmarks(random.Random(args.seed))
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": path,
+            "companies": args.companies,
+            "jobs": args.jobs,
+            "tags": args.tags,
+            "tag_density": args.tag_density,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "results": {},
+    }
+
+    print(f"{'benchmark':<34} {'ops/sec':>10} {'p50':>10} {'p99':>10} {'peak mem':>11}")
+    for name, iterations, setup, operation in benchmarks.all(args.scale):
+        if args.only and not any(text in name for text in args.only):
+            continue
+        result = run_benchmark(iterations, setup, operation)
+        results["results"][name] = result
+        print(f"{name:<34} {result['ops_per_sec']:>10.1f} {result['p50_ms']:>8.3f}ms "
+              f"{result['p99_ms']:>8.3f}ms {result['peak_memory_kib']:>8.0f}KiB")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
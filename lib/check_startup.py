@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# lib/check_startup.py
+"""Fail when importing main.py gets slower or starts pulling in heavy modules.
+
+    python lib/check_startup.py --budget-ms 150
+
+Runs `python -X importtime -c "import main"` a few times and keeps the fastest
+run. Exits with status 1 if the cumulative import time of main is over budget,
+or if any module in LAZY_MODULES was imported at startup; those are meant to
+load only when a command needs them.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Debugger, rendering, data-generation and number-crunching dependencies must not load on startup.
+LAZY_MODULES = ("ipdb", "IPython", "rich", "faker", "asyncio", "concurrent.futures", "numpy")
+
+
+def measure_import(module="main"):
+    """Return ({module name: cumulative microseconds}, total microseconds for module)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=LIB_DIR, capture_output=True, text=True, check=True
+    )
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            imported[name.strip()] = int(cumulative)
+    return imported, imported.get(module, 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the import-time budget for lib/main.py.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="maximum cumulative import time of main")
+    parser.add_argument("--runs", type=int, default=3, help="take the fastest of this many runs")
+    args = parser.parse_args(argv)
+
+    best_imported, best_total = None, None
+    for _ in range(args.runs):
+        imported, total = measure_import()
+        if best_total is None or total < best_total:
+            best_imported, best_total = imported, total
+
+    failures = []
+    eager = sorted(name for name in best_imported if name.split(".")[0] in LAZY_MODULES or name in LAZY_MODULES)
+    if eager:
+        failures.append(f"imported at startup but should load lazily: {', '.join(eager)}")
+    if best_total / 1000 > args.budget_ms:
+        failures.append(f"main imports in {best_total / 1000:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    slowest = sorted(best_imported.items(), key=lambda item: -item[1])[:8]
+    print(f"main imports in {best_total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms). Slowest cumulative:")
+    for name, micros in slowest:
+        print(f"  {micros / 1000:8.1f} ms  {name.strip()}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,32 @@
 # cli.py
+from models import parse_date, trace_command
 from models.company import Company
 from models.job_application import JobApplication
 from models.tag import Tag
 from models.job_application_tag import JobApplicationTag
-from datetime import datetime
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
+from models.identity_map import identity_map
+from datetime import date, timedelta
+from functools import partial
+from itertools import chain
 from helpers import Helpers
 
+class BatchError(Exception):
+    """A scripted command is missing an option or was given an invalid one."""
+
+
 class CLI:
+    PAGE_SIZE = 20
+    JOB_FIELDS = ("id", "job_title", "company_id", "description", "date_applied", "last_follow_up", "status")
+    COMPANY_FIELDS = ("id", "name", "website", "contact_info")
+    TAG_FIELDS = ("id", "name", "tag_type")
+
     def __init__(self):
-        self.console = Console()
+        self._console = None
         self.helpers = Helpers()
+        # Set by execute() for scripted commands: the option values that answer the
+        # prompts, and the record writer that listings stream to instead of rich.
+        self.options = None
+        self.writer = None
         self.command_handlers = {
             "exit": self.exit_program,
             "quit": self.exit_program,
@@ -25,16 +38,36 @@ class CLI:
             "assign tag": self.assign_tag_to_job,
             "remove tag": self.remove_tag_from_job,
             "list jobs by tag": self.list_jobs_by_tag,
+            "filter jobs": self.filter_jobs,
             "list jobs": self.list_jobs,
+            "search": self.search_jobs,
+            "due follow-ups": self.due_follow_ups,
             "create job": self.create_job,
+            "import jobs": self.import_jobs,
+            "export": self.export_data,
             "update job": self.update_job,
             "delete job": self.delete_job,
             "list companies": self.list_companies,
             "create company": self.create_company,
             "update company": self.update_company,
             "delete company": self.delete_company,
+            "top companies": self.top_companies,
+            "status report": self.status_report,
+            "rebuild stats": self.rebuild_stats,
         }
 
+    @property
+    def console(self):
+        """The rich Console, created (and rich imported) on first use."""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+    @console.setter
+    def console(self, console):
+        self._console = console
+
     def start(self):
         """Start the CLI application."""
         self.show_welcome()
@@ -46,12 +79,120 @@ class CLI:
             command = input("\n🏠 Enter a command: ").strip().lower()
             
             if command in self.command_handlers:
-                self.command_handlers[command]()
+                self.execute(command)
             else:
                 print("Invalid command. Type 'help' for a list of available commands.")
 
+    @property
+    def interactive(self):
+        return self.options is None
+
+    def execute(self, command, options=None, writer=None):
+        """Run one command from command_handlers.
+
+        With options (a dict of answers keyed by prompt name) the command runs
+        without prompting, and listings stream records to writer instead of
+        drawing tables.
+        """
+        self.options, self.writer = options, writer
+        # Each command starts from the database, not objects cached by the last one.
+        identity_map.clear()
+        try:
+            with trace_command(command):
+                self.command_handlers[command]()
+        finally:
+            self.options = self.writer = None
+
+    def fail(self, message):
+        """Report why a command couldn't run: printed when interactive, raised as a
+        BatchError when scripted, so batch counts it and exits non-zero.
+        """
+        if not self.interactive:
+            raise BatchError(message)
+        print(message)
+
+    def ask(self, key, prompt, required=True, choices=None):
+        """Prompt for a value, or take it from the scripted option named key."""
+        if self.interactive:
+            return input(prompt)
+        value = self.options.get(key)
+        if value is None:
+            if required:
+                raise BatchError(f"missing option --{key.replace('_', '-')}")
+            return ""
+        if choices and value.strip().lower() not in choices:
+            raise BatchError(f"--{key.replace('_', '-')} must be one of: {', '.join(sorted(choices))}")
+        return value
+
+    def ask_date(self, key, prompt, required=True, must_be_after=None):
+        """Like Helpers.get_valid_date, but a bad scripted value is an error rather than a re-prompt."""
+        if must_be_after:
+            must_be_after = parse_date(must_be_after)
+        if self.interactive:
+            return self.helpers.get_valid_date(prompt, required=required, must_be_after=must_be_after)
+        value = self.ask(key, prompt, required=required).strip()
+        if not value:
+            return None
+        try:
+            parsed_date = parse_date(value)
+        except ValueError:
+            raise BatchError(f"--{key.replace('_', '-')} must be a YYYY-MM-DD date")
+        if must_be_after and parsed_date < must_be_after:
+            raise BatchError(f"--{key.replace('_', '-')} must be after {must_be_after}")
+        return parsed_date
+
+    def show_choices(self, list_handler):
+        """List the records a prompt picks from; scripted commands already know their IDs."""
+        if self.interactive:
+            list_handler()
+
+    def emit(self, records, fields):
+        """Stream model objects to the writer as records of the given fields."""
+        for record in records:
+            self.writer.write({field: getattr(record, field) for field in fields})
+
+    def paginate(self, get_page, render_page):
+        """Show records one keyset page at a time.
+
+        get_page is a model's get_page classmethod and render_page draws a list of
+        records. The user can move with n (next), p (previous) or j <id> (jump to
+        an ID); pressing Enter leaves the listing. Returns False if there is
+        nothing to show.
+        """
+        page = get_page(after_id=0, limit=self.PAGE_SIZE)
+        if not page:
+            return False
+
+        render_page(page)
+        if len(page) < self.PAGE_SIZE:
+            return True
+
+        while True:
+            choice = input("[n]ext, [p]rev, [j]ump <id>, or Enter to continue: ").strip().lower()
+            if choice in ("n", "next"):
+                new_page = get_page(after_id=page[-1].id, limit=self.PAGE_SIZE)
+            elif choice in ("p", "prev"):
+                new_page = get_page(before_id=page[0].id, limit=self.PAGE_SIZE)
+            elif choice.startswith("j"):
+                target = self.helpers.validate_numeric_id(choice.lstrip("jump").strip(), "record")
+                if target is None:
+                    continue
+                new_page = get_page(after_id=target - 1, limit=self.PAGE_SIZE)
+            else:
+                return True
+
+            if not new_page:
+                print("No more records in that direction.")
+                continue
+            page = new_page
+            render_page(page)
+
     def show_welcome(self):
         """Display the welcome message and quick commands in a table format."""
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+
         self.console.print(
             Panel.fit(
                 Text("💼 Job Application Tracker 💼", style="bold cyan"),
@@ -88,6 +229,8 @@ class CLI:
 
     def show_help(self):
         """Display available commands in a table format."""
+        from rich.table import Table
+
         table = Table(title="Available Commands", show_header=True, header_style="bold cyan")
 
         table.add_column("Command", style="bold yellow")
@@ -101,15 +244,23 @@ class CLI:
             ("delete tag", "Remove a tag by ID"),
             ("assign tag", "Assign a tag to a job application"),
             ("remove tag", "Remove a tag from a job application"),
-            ("list jobs", "List all job applications"),
+            ("list jobs", "List job applications a page at a time"),
             ("list jobs by tag", "Show jobs associated with a tag"),
+            ("filter jobs", "Jobs with all / any / none of several tags, by status"),
+            ("search", "Find jobs by words in their title, description or company"),
+            ("due follow-ups", "Applications overdue for a follow-up, most overdue first"),
             ("create job", "Add a new job application"),
+            ("import jobs", "Import job applications from a CSV or JSONL file"),
+            ("export", "Export companies, jobs, tags and their links to CSV or JSONL"),
             ("update job", "Update an existing job application"),
             ("delete job", "Remove a job application"),
-            ("list companies", "Show all companies"),
+            ("list companies", "Show companies a page at a time"),
             ("create company", "Add a new company"),
             ("update company", "Update an existing company"),
             ("delete company", "Remove a company"),
+            ("top companies", "Companies with the most applications"),
+            ("status report", "Applications at each stage of the funnel"),
+            ("rebuild stats", "Recount the application summary from scratch"),
         ]
 
         for command, description in commands:
@@ -119,19 +270,22 @@ class CLI:
 
     def list_tags(self):
         """List all tags stored in the database."""
-        tags = Tag.get_all()
-        if not tags:
+        if self.writer:
+            return self.emit(Tag.iter_all(view=True), self.TAG_FIELDS)
+        tags = Tag.iter_all(view=True)
+        first = next(tags, None)
+        if first is None:
             print("No tags found.")
         else:
             print("\nTags:")
-            for tag in tags:
+            for tag in chain([first], tags):
                 print(f"  {tag.id}: {tag.name} ({tag.tag_type})")
 
     def create_tag(self):
         """Prompt the user to create a new tag."""
         try:
-            name = input("Enter tag name: ").strip().capitalize()
-            tag_type = input("Enter tag type (location or length): ").strip().capitalize()
+            name = self.ask("name", "Enter tag name: ").strip().capitalize()
+            tag_type = self.ask("tag_type", "Enter tag type (location or length): ").strip().lower()
             
             if tag_type not in ["location", "length"]:
                 raise ValueError("Invalid tag type. Must be 'location' or 'length'.")
@@ -141,112 +295,220 @@ class CLI:
             tag.save()
             if tag.id:
                 print(f"Tag '{name}' added successfully.")
+            else:
+                self.fail(f"Tag '{name}' was not added.")
 
+        except BatchError:
+            raise
         except ValueError as ve:
-            print(f"ValueError: {ve}")
+            self.fail(f"ValueError: {ve}")
         except AttributeError as ae:
-            print(f"AttributeError: {ae} - Check if your inputs are correctly formatted.")
+            self.fail(f"AttributeError: {ae} - Check if your inputs are correctly formatted.")
         except TypeError as te:
-            print(f"TypeError: {te} - Unexpected data type encountered.")
+            self.fail(f"TypeError: {te} - Unexpected data type encountered.")
         except Exception as e:
-            print(f"Unexpected error: {e}")
+            self.fail(f"Unexpected error: {e}")
 
     def delete_tag(self):
         """Prompt the user to delete a tag."""
-        self.list_tags()
-        tag_id = input("Enter the tag ID to delete: ").strip()
-        
+        self.show_choices(self.list_tags)
+        tag_id = self.ask("tag_id", "Enter the tag ID to delete: ").strip()
+
         try:
             tag_id = int(tag_id)
-            Tag.delete(tag_id)
+            if not Tag.find_by_id(tag_id):
+                self.fail(f"Tag ID {tag_id} not found.")
+                return
+            if not Tag.delete(tag_id):
+                self.fail(f"Tag {tag_id} was not deleted.")
+                return
             print(f"Tag {tag_id} deleted successfully.")
         except ValueError:
-            print("Invalid input. Please enter a valid tag ID.")
+            self.fail("Invalid input. Please enter a valid tag ID.")
 
     def assign_tag_to_job(self):
         """Assign a tag to a job application via JobApplication."""
-        self.list_jobs()
-        job_id = input("Enter job application ID: ").strip()
-        self.list_tags()
-        tag_id = input("Enter tag ID: ").strip()
+        self.show_choices(self.list_jobs)
+        job_id = self.ask("job_id", "Enter job application ID: ").strip()
+        self.show_choices(self.list_tags)
+        tag_id = self.ask("tag_id", "Enter tag ID: ").strip()
 
         try:
             job_id, tag_id = int(job_id), int(tag_id)
             job = JobApplication.find_by_id(job_id)
 
             if not job:
-                print(f"Job application ID {job_id} not found.")
+                self.fail(f"Job application ID {job_id} not found.")
                 return
-            
-            job.add_tag(tag_id)
+
+            if not job.add_tag(tag_id):
+                self.fail(f"Tag {tag_id} was not assigned to job {job_id}.")
         except ValueError:
-            print("Invalid input. Please enter valid numerical IDs.")
+            self.fail("Invalid input. Please enter valid numerical IDs.")
 
     def remove_tag_from_job(self):
         """Remove a tag from a job application."""
-        self.list_jobs()
-        job_id = input("Enter job application ID: ").strip()
-        self.list_tags()
-        tag_id = input("Enter tag ID: ").strip()
-        
+        self.show_choices(self.list_jobs)
+        job_id = self.ask("job_id", "Enter job application ID: ").strip()
+        self.show_choices(self.list_tags)
+        tag_id = self.ask("tag_id", "Enter tag ID: ").strip()
+
         try:
             job_id, tag_id = int(job_id), int(tag_id)
-            JobApplicationTag.delete_tag_from_job(job_id, tag_id)
-            print(f"Tag {tag_id} removed from job {job_id}.")
+            if not JobApplicationTag.delete_tag_from_job(job_id, tag_id):
+                self.fail(f"Tag {tag_id} is not assigned to job {job_id}.")
         except ValueError:
-            print("Invalid input. Please enter valid numerical IDs.")
+            self.fail("Invalid input. Please enter valid numerical IDs.")
 
     def list_jobs(self):
-        """List all job applications as a table."""
-        jobs = JobApplication.get_all()
-
-        if not jobs:
+        """List job applications as a paged table."""
+        if self.writer:
+            status = self.ask("status", "", required=False, choices=JobApplication.VALID_STATUSES).strip().lower()
+            company_id = self.ask("company_id", "", required=False).strip()
+            if company_id and not company_id.isdigit():
+                raise BatchError("--company-id must be a numeric ID")
+            applied_from = self.ask_date("applied_from", "", required=False)
+            applied_to = self.ask_date("applied_to", "", required=False)
+            days = self.ask("days", "", required=False).strip()
+            if days:
+                if not days.isdigit():
+                    raise BatchError("--days must be a number")
+                applied_from = date.today() - timedelta(days=int(days))
+            jobs = JobApplication.iter_all(
+                status=status or None, company_id=int(company_id) if company_id else None,
+                applied_from=applied_from, applied_to=applied_to, view=True
+            )
+            return self.emit(jobs, self.JOB_FIELDS)
+        if not self.paginate(partial(JobApplication.get_page, view=True), self.render_jobs):
             print("No job applications found.")
-        else:
-            table = Table(title="Job Applications", show_header=True, header_style="bold cyan")
-            table.add_column("Job ID", style="bold yellow")
-            table.add_column("Job Title", style="white")
-            table.add_column("Status", style="green")
 
-            for job in jobs:
-                table.add_row(str(job.id), job.job_title, job.status)
+    def render_jobs(self, jobs):
+        """Render one page of job applications as a table."""
+        from rich.table import Table
+
+        table = Table(title="Job Applications", show_header=True, header_style="bold cyan")
+        table.add_column("Job ID", style="bold yellow")
+        table.add_column("Job Title", style="white")
+        table.add_column("Status", style="green")
+
+        for job in jobs:
+            table.add_row(str(job.id), job.job_title, job.status)
+
+        self.console.print(table)
+
+    def search_jobs(self):
+        """Full-text search over job titles, descriptions and company names."""
+        query = self.ask("query", "Search for: ").strip()
+        if self.writer:
+            limit = self.ask("limit", "", required=False).strip() or str(self.PAGE_SIZE)
+            if not limit.isdigit():
+                raise BatchError("--limit must be a number")
+            for job, snippet in JobApplication.search(query, limit=int(limit)):
+                record = {field: getattr(job, field) for field in self.JOB_FIELDS}
+                record["snippet"] = snippet
+                self.writer.write(record)
+            return
+
+        results = JobApplication.search(query, limit=self.PAGE_SIZE, mark=("\x02", "\x03"))
+        if not results:
+            print(f"No job applications match '{query}'.")
+            return
+
+        from rich.markup import escape
+        from rich.table import Table
+
+        table = Table(title=f"Search: {escape(query)}", show_header=True, header_style="bold cyan")
+        table.add_column("Job ID", style="bold yellow")
+        table.add_column("Job Title", style="white")
+        table.add_column("Status", style="green")
+        table.add_column("Match", style="white")
+
+        for job, snippet in results:
+            snippet = escape(snippet).replace("\x02", "[bold magenta]").replace("\x03", "[/bold magenta]")
+            table.add_row(str(job.id), escape(job.job_title), job.status, snippet)
+
+        self.console.print(table)
+
+    def due_follow_ups(self):
+        """Applications due a follow-up (see JobApplication.FOLLOW_UP_DAYS), most overdue first."""
+        as_of = date.today()
+        limit = self.PAGE_SIZE
+        if self.writer:
+            as_of = self.ask_date("as_of", "", required=False) or as_of
+            limit = self.ask("limit", "", required=False).strip() or str(limit)
+            if not limit.isdigit():
+                raise BatchError("--limit must be a number")
+            for job, due_date in JobApplication.due_for_follow_up(as_of, int(limit), view=True):
+                record = {field: getattr(job, field) for field in self.JOB_FIELDS}
+                record["due_date"] = due_date
+                record["days_overdue"] = (as_of - due_date).days
+                self.writer.write(record)
+            return
+
+        due = JobApplication.due_for_follow_up(as_of, limit, view=True)
+        if not due:
+            print("No applications are due a follow-up.")
+            return
+
+        from rich.table import Table
+
+        table = Table(title=f"Due Follow-ups ({as_of})", show_header=True, header_style="bold cyan")
+        table.add_column("Job ID", style="bold yellow")
+        table.add_column("Job Title", style="white")
+        table.add_column("Status", style="green")
+        table.add_column("Last Contact", style="white")
+        table.add_column("Due", style="white")
+        table.add_column("Days Overdue", style="bold red", justify="right")
+
+        for job, due_date in due:
+            table.add_row(str(job.id), job.job_title, job.status, str(job.last_follow_up or job.date_applied),
+                          str(due_date), str((as_of - due_date).days))
 
-            self.console.print(table)
+        self.console.print(table)
+        if len(due) == limit:
+            print(f"Showing the {limit} most overdue.")
 
     def create_job(self):
         """Prompt the user to create a new job application."""
-        job_title = input("Enter job title: ").strip().capitalize()
-        
-        company_name = input("Enter company name: ").strip().capitalize()
-        
+        job_title = self.ask("job_title", "Enter job title: ").strip().capitalize()
+
+        company_name = self.ask("company", "Enter company name: ").strip().capitalize()
+
         company = Company.find_by_name(company_name)
-        
+
         if not company:
             print(f"No company found with the name '{company_name}'")
-            question = input("Would you like to create a company? (Y/N)").strip()
-            if question.upper() == "Y":
-                website = input("Enter company website: ").strip().lower()
-                contact_info = input("Enter company contact info: ").strip().lower()
+            question = self.ask("create_company", "Would you like to create a company? (Y/N)", required=False).strip()
+            if question.upper() in ("Y", "YES"):
+                website = self.ask("website", "Enter company website: ", required=False).strip().lower()
+                contact_info = self.ask("contact_info", "Enter company contact info: ", required=False).strip().lower()
                 company = Company(name=company_name, website=website or None, contact_info=contact_info or None)
-                company.save()
+                if company.save() is not company:
+                    self.fail(f"Company '{company_name}' could not be created.")
+                    return
                 print(f"{company.name} created successfully!")
             else:
+                if not self.interactive:
+                    self.fail(f"No company found with the name '{company_name}' (pass --create-company to create it)")
                 return
-        
-        description = input("Enter job description: ").strip().lower()
-        date_applied = self.helpers.get_valid_date("Enter date applied (YYYY-MM-DD): ")
+
+        description = self.ask("description", "Enter job description: ", required=False).strip().lower()
+        date_applied = self.ask_date("date_applied", "Enter date applied (YYYY-MM-DD): ")
         if not date_applied:
             return
             
-        last_follow_up = self.helpers.get_valid_date(
+        last_follow_up = self.ask_date(
+            "last_follow_up",
             "Enter last follow-up date (YYYY-MM-DD or leave blank): ", 
             required=False, 
             must_be_after=date_applied
         )
 
         valid_statuses = ["applied", "pending", "rejected", "offer"]
-        status = input("Enter job status (applied, pending, rejected, offer): ").strip().lower()
-        
+        status = self.ask(
+            "status", "Enter job status (applied, pending, rejected, offer): ", choices=valid_statuses
+        ).strip().lower()
+
         while status not in valid_statuses:
             print("Invalid status. Please enter one of the following: applied, pending, rejected, offer.")
             status = input("Enter job status (applied, pending, rejected, offer): ").strip().lower()
@@ -261,68 +523,129 @@ class CLI:
                 status=status
             )
             job.save()
+            if job.id is None:
+                self.fail(f"Job application '{job_title}' was not saved.")
+                return
             print(f"Job application '{job_title}' created successfully!")
         except ValueError as e:
-            print(f"Error: {e}")
+            self.fail(str(e))
+
+    def import_jobs(self):
+        """Bulk-import job applications from a CSV or JSONL file."""
+        import importer
+
+        path = self.ask("path", "Enter the path of a CSV or JSONL file: ").strip()
+        rejects = self.ask("rejects", "Write rejected rows to (leave blank for the default): ", required=False).strip()
+        format = self.ask("input_format", "", required=False).strip().lower() if self.writer else ""
+        try:
+            summary = importer.import_jobs(path, format=format or None, rejects_path=rejects or None)
+        except BrokenPipeError:
+            raise
+        except (OSError, ValueError) as e:
+            self.fail(str(e))
+            return
+
+        if self.writer:
+            self.writer.write(summary)
+            return
+        print(f"Imported {summary['imported']} job applications "
+              f"({summary['companies_created']} new companies).")
+        if summary["rejected"]:
+            print(f"{summary['rejected']} rows were rejected; see {summary['rejects_file']}.")
+
+    def export_data(self):
+        """Export the tracker's tables to CSV or JSONL files."""
+        import exporter
+
+        path = self.ask("path", "Export to directory: ").strip()
+        table = self.ask("table", f"Table to export ({', '.join(exporter.TABLES)}; leave blank for all): ",
+                         required=False, choices=exporter.TABLES).strip().lower()
+        format = self.ask("output_format", "Format (csv/jsonl, default jsonl): ",
+                          required=False, choices=exporter.EXPORT_FORMATS).strip().lower() or "jsonl"
+        details = self.ask("details", "Include company names and tags in job rows? (Y/N) ", required=False).strip()
+        try:
+            counts = exporter.export(
+                path, tables=(table,) if table else exporter.TABLES, format=format,
+                details=details.upper() in ("Y", "YES"), stdout=self.writer.stream if self.writer else None
+            )
+        except BrokenPipeError:
+            raise
+        except (OSError, ValueError) as e:
+            self.fail(str(e))
+            return
+
+        if path == "-":
+            return
+        if self.writer:
+            for name, rows in counts.items():
+                self.writer.write({"table": name, "rows": rows})
+            return
+        for name, rows in counts.items():
+            print(f"Exported {rows} {name} rows to {path}.")
 
     def update_job(self):
         """Prompt the user to update an existing job application."""
-        self.list_jobs()
-        job_id = input("Enter job application ID to update: ").strip()
+        self.show_choices(self.list_jobs)
+        job_id = self.ask("job_id", "Enter job application ID to update: ").strip()
 
         try:
             job_id = int(job_id)
             job = JobApplication.find_by_id(job_id)
             
             if not job:
-                print(f"Job application with ID {job_id} not found.")
+                self.fail(f"Job application with ID {job_id} not found.")
                 return
 
             print(f"Updating job application: {job.job_title} at Company ID {job.company_id}")
 
-            job_title = input(f"Enter new job title (current: {job.job_title}): ").strip().capitalize()
-            company_name = input(f"Enter new company name (current: {job.company_id}): ").strip().capitalize()
+            job_title = self.ask("job_title", f"Enter new job title (current: {job.job_title}): ", required=False).strip().capitalize()
+            company_name = self.ask("company", f"Enter new company name (current: {job.company_id}): ", required=False).strip().capitalize()
 
             company = Company.find_by_name(company_name) if company_name else None
 
             if company_name and not company:
-                print(f"No company found with the name '{company_name}'. Please ensure the company exists.")
+                self.fail(f"No company found with the name '{company_name}'. Please ensure the company exists.")
                 return
 
-            description = input(f"Enter new job description (current: {job.description}): ").strip().lower()
+            description = self.ask("description", f"Enter new job description (current: {job.description}): ", required=False).strip().lower()
             
-            date_applied = self.helpers.get_valid_date(
+            date_applied = self.ask_date(
+                "date_applied",
                 f"Enter new date applied (current: {job.date_applied}, leave blank to keep current): ", 
                 required=False
             )
             
-            last_follow_up = self.helpers.get_valid_date(
+            last_follow_up = self.ask_date(
+                "last_follow_up",
                 f"Enter new last follow-up date (current: {job.last_follow_up}, leave blank to keep current): ", 
                 required=False,
                 must_be_after=date_applied or job.date_applied
             )
             
-            status = input(f"Enter new status (current: {job.status}): ").strip().lower()
+            status = self.ask(
+                "status", f"Enter new status (current: {job.status}): ",
+                required=False, choices=JobApplication.VALID_STATUSES
+            ).strip().lower()
 
             try:
-                job.job_title = job_title if job_title else job.job_title
-                job.company_id = company.id if company else job.company_id
-                job.description = description if description else job.description
-                job.date_applied = date_applied if date_applied else job.date_applied
-                job.last_follow_up = last_follow_up if last_follow_up is not None else job.last_follow_up
-                job.status = status if status else job.status
-
-                job.update()
+                job.update(
+                    job_title=job_title if job_title else job.job_title,
+                    company_id=company.id if company else job.company_id,
+                    description=description if description else job.description,
+                    date_applied=date_applied if date_applied else job.date_applied,
+                    last_follow_up=last_follow_up if last_follow_up is not None else job.last_follow_up,
+                    status=status if status else job.status
+                )
                 print(f"Job application with ID {job_id} updated successfully.")
             except ValueError as e:
-                print(f"Error: {e}")
+                self.fail(str(e))
         except ValueError:
-            print("Invalid input. Please enter a valid job application ID.")
+            self.fail("Invalid input. Please enter a valid job application ID.")
 
     def delete_job(self):
         """Prompt the user to delete a job application."""
-        self.list_jobs()
-        job_id = input("Enter job application ID to delete: ").strip()
+        self.show_choices(self.list_jobs)
+        job_id = self.ask("job_id", "Enter job application ID to delete: ").strip()
         try:
             job_id = int(job_id)
             job = JobApplication.find_by_id(job_id)
@@ -330,59 +653,65 @@ class CLI:
                 job.delete()
                 print(f"Job application ID {job_id} deleted successfully.")
             else:
-                print(f"Job application ID {job_id} not found.")
+                self.fail(f"Job application ID {job_id} not found.")
         except ValueError:
-            print("Invalid input. Please enter a valid job ID.")
+            self.fail("Invalid input. Please enter a valid job ID.")
 
     def list_companies(self):
-        """List all companies as a table."""
-        companies = Company.get_all()
-
-        if not companies:
+        """List companies as a paged table."""
+        if self.writer:
+            return self.emit(Company.iter_all(view=True), self.COMPANY_FIELDS)
+        if not self.paginate(partial(Company.get_page, view=True), self.render_companies):
             print("No companies found.")
-        else:
-            table = Table(title="Companies", show_header=True, header_style="bold cyan")
-            table.add_column("Company ID", style="bold yellow")
-            table.add_column("Company Name", style="white")
-            table.add_column("Website", style="white")
-            table.add_column("Contact Info", style="white")
-
-            for company in companies:
-                table.add_row(
-                    str(company.id), 
-                    company.name, 
-                    company.website or "-", 
-                    company.contact_info or "-"
-                )
 
-            self.console.print(table)
+    def render_companies(self, companies):
+        """Render one page of companies as a table."""
+        from rich.table import Table
+
+        table = Table(title="Companies", show_header=True, header_style="bold cyan")
+        table.add_column("Company ID", style="bold yellow")
+        table.add_column("Company Name", style="white")
+        table.add_column("Website", style="white")
+        table.add_column("Contact Info", style="white")
+
+        for company in companies:
+            table.add_row(
+                str(company.id), 
+                company.name, 
+                company.website or "-", 
+                company.contact_info or "-"
+            )
+
+        self.console.print(table)
 
     def create_company(self):
         """Prompt user to create new company"""
-        name = input("Enter company name: ").strip().capitalize()
-        website = input("Enter company website: ").strip().lower()
-        contact_info = input("Enter company contact info: ").strip().lower()
+        name = self.ask("name", "Enter company name: ").strip().capitalize()
+        website = self.ask("website", "Enter company website: ", required=False).strip().lower()
+        contact_info = self.ask("contact_info", "Enter company contact info: ", required=False).strip().lower()
 
         company = Company(name=name, website=website or None, contact_info=contact_info or None)
-        company.save()
+        if company.save() is not company:
+            self.fail(f"Company '{name}' could not be created.")
+            return
         print(f"{company.name} created successfully!")
 
     def update_company(self):
         """Prompt the user to update a company."""
-        self.list_companies()
-        company_id = input("Enter the company ID you want to update: ").strip()
+        self.show_choices(self.list_companies)
+        company_id = self.ask("company_id", "Enter the company ID you want to update: ").strip()
 
         try:
             company_id = int(company_id)
             company = Company.find_by_id(company_id)
             if not company:
-                print(f"Company with ID: {company_id} not found.")
+                self.fail(f"Company with ID: {company_id} not found.")
                 return
                 
             print(f"Updating company: {company.name}")
-            name = input(f"Enter new name (current: {company.name}): ").strip().capitalize()
-            website = input(f"Enter new website (current: {company.website}): ").strip().lower()
-            contact_info = input(f"Enter new contact info (current: {company.contact_info}): ").strip().lower()
+            name = self.ask("name", f"Enter new name (current: {company.name}): ", required=False).strip().capitalize()
+            website = self.ask("website", f"Enter new website (current: {company.website}): ", required=False).strip().lower()
+            contact_info = self.ask("contact_info", f"Enter new contact info (current: {company.contact_info}): ", required=False).strip().lower()
 
             company.name = name if name else company.name
             company.website = website if website else company.website
@@ -391,13 +720,13 @@ class CLI:
             company.update()
             print(f"Company with ID {company_id} updated successfully.")
         except ValueError:
-            print("Invalid input. Please enter a valid company ID.")
+            self.fail("Invalid input. Please enter a valid company ID.")
 
     def delete_company(self):
         """Prompt the user to delete a company."""
-        self.list_companies()
-        company_id = input("Enter the company ID to delete: ").strip()
-        
+        self.show_choices(self.list_companies)
+        company_id = self.ask("company_id", "Enter the company ID to delete: ").strip()
+
         try:
             company_id = int(company_id)
 
@@ -407,21 +736,84 @@ class CLI:
                 company.delete()
                 print(f"Company with ID {company_id} ({company.name}) deleted successfully.")
             elif company is None:
-                print(f"Company with ID {company_id} not found.")
+                self.fail(f"Company with ID {company_id} not found.")
             else:
-                print(f"Error: {company}")
+                self.fail(company)
         except ValueError:
-            print("Invalid input. Please enter a valid company ID.")
+            self.fail("Invalid input. Please enter a valid company ID.")
+
+    def top_companies(self):
+        """Show the companies with the most applications, optionally for one status."""
+        status = self.ask(
+            "status", "Count only applications with status (leave blank for all): ",
+            required=False, choices=JobApplication.VALID_STATUSES
+        ).strip().lower()
+        if status and status not in JobApplication.VALID_STATUSES:
+            print("Invalid status. Please enter one of the following: applied, pending, rejected, offer.")
+            return
+        limit = self.ask("limit", "How many companies? (default 10): ", required=False).strip() or "10"
+        if not limit.isdigit():
+            self.fail("--limit must be a number" if not self.interactive else "Invalid input. Please enter a number.")
+            return
+
+        ranking = Company.top_n(int(limit), status=status or None)
+        if self.writer:
+            for company, applications in ranking:
+                self.writer.write({"company_id": company.id, "name": company.name, "applications": applications})
+            return
+        if not ranking:
+            print("No job applications found.")
+            return
+
+        from rich.table import Table
+
+        table = Table(title=f"Top Companies{f' ({status})' if status else ''}", show_header=True, header_style="bold cyan")
+        table.add_column("Company ID", style="bold yellow")
+        table.add_column("Company Name", style="white")
+        table.add_column("Applications", style="green", justify="right")
+        for company, applications in ranking:
+            table.add_row(str(company.id), company.name, str(applications))
+        self.console.print(table)
+
+    def status_report(self):
+        """Show how many applications are at each status."""
+        company_id = self.options.get("company_id") if self.writer else None
+        if company_id and not company_id.isdigit():
+            raise BatchError("--company-id must be a numeric ID")
+        funnel = JobApplication.status_funnel(company_id=int(company_id) if company_id else None)
+        if self.writer:
+            for status, applications, share in funnel:
+                self.writer.write({"status": status, "applications": applications, "share": round(share, 4)})
+            return
+
+        from rich.table import Table
+
+        table = Table(title="Status Funnel", show_header=True, header_style="bold cyan")
+        table.add_column("Status", style="bold yellow")
+        table.add_column("Applications", style="white", justify="right")
+        table.add_column("Share", style="green", justify="right")
+        for status, applications, share in funnel:
+            table.add_row(self.helpers.format_status(status), str(applications), f"{share:.1%}")
+        self.console.print(table)
+
+    def rebuild_stats(self):
+        """Recount the application summary behind top companies and the status report."""
+        JobApplication.rebuild_counts()
 
     def list_jobs_by_tag(self):
         """List all job applications associated with a specific tag."""
-        self.list_tags()
-        tag_id = input("Enter tag ID to list jobs: ").strip()
+        self.show_choices(self.list_tags)
+        tag_id = self.ask("tag_id", "Enter tag ID to list jobs: ").strip()
 
         try:
             tag_id = int(tag_id)
             tag = Tag.find_by_id(tag_id)
+            if not tag:
+                self.fail(f"Tag ID {tag_id} not found.")
+                return
             jobs = tag.job_applications()
+            if self.writer:
+                return self.emit(jobs, self.JOB_FIELDS)
 
             if not jobs:
                 print("No job applications found with this tag.")
@@ -430,4 +822,31 @@ class CLI:
                 for job in jobs:
                     print(f"  {job.id}: {job.job_title}")
         except ValueError:
-            print("Invalid input. Please enter a valid tag ID.")
\ No newline at end of file
+            self.fail("Invalid input. Please enter a valid tag ID.")
+
+    def filter_jobs(self):
+        """List job applications by tag expression, e.g. remote AND full-time AND NOT contract."""
+        def names(key, prompt):
+            return [name.strip() for name in self.ask(key, prompt, required=False).split(",") if name.strip()]
+
+        if self.interactive:
+            self.show_choices(self.list_tags)
+        filters = {
+            "tags_all": names("all", "Tags the job must have all of (comma-separated, blank to skip): "),
+            "tags_any": names("any", "Tags the job must have at least one of: "),
+            "tags_none": names("none", "Tags the job must not have: "),
+            "status": [status.lower() for status in names("status", "Statuses to include (blank for all): ")] or None,
+        }
+        company_id = self.ask("company_id", "", required=False).strip() if self.writer else ""
+        if company_id:
+            if not company_id.isdigit():
+                raise BatchError("--company-id must be a numeric ID")
+            filters["company_id"] = int(company_id)
+
+        try:
+            if self.writer:
+                return self.emit(JobApplication.iter_filter(view=True, **filters), self.JOB_FIELDS)
+            if not self.paginate(partial(JobApplication.filter, view=True, **filters), self.render_jobs):
+                print("No job applications match those tags.")
+        except ValueError as e:
+            self.fail(str(e))
\ No newline at end of file
@@ -0,0 +1,63 @@
+# lib/exporter.py
+"""Stream the tracker's tables out to CSV or JSONL files.
+
+    python lib/main.py export --path backup
+    python lib/main.py export --path backup --output-format csv --details
+    python lib/main.py export --path - --table jobs > jobs.jsonl
+
+Each table is written to <path>/<table>.<format>; `-` writes a single --table to
+stdout. The models' export() methods have SQLite render every line and copy it
+out a fetchmany batch at a time, so memory stays flat however large the
+database is. With details, job rows also carry the company name and tag names,
+joined in by the query that reads them.
+"""
+import os
+import sys
+
+from models import EXPORT_FORMATS
+from models.company import Company
+from models.job_application import JobApplication
+from models.job_application_tag import JobApplicationTag
+from models.tag import Tag
+
+TABLES = ("companies", "jobs", "tags", "job_tags")
+
+
+def export_table(table, stream, format="jsonl", details=False, batch_size=1000):
+    """Write one table to stream and return the number of rows written."""
+    if table == "companies":
+        return Company.export(stream, format, batch_size)
+    if table == "jobs":
+        return JobApplication.export(stream, format, details, batch_size)
+    if table == "tags":
+        return Tag.export(stream, format, batch_size)
+    if table == "job_tags":
+        return JobApplicationTag.export(stream, format, batch_size)
+    raise ValueError(f"Unknown table '{table}'. Use one of: {', '.join(TABLES)}.")
+
+
+def export(path, tables=TABLES, format="jsonl", details=False, batch_size=1000, stdout=None):
+    """Export tables to <path>/<table>.<format>, or one table to stdout when path is "-".
+
+    Returns {table: rows written}.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+    unknown = [table for table in tables if table not in TABLES]
+    if unknown:
+        raise ValueError(f"Unknown table '{unknown[0]}'. Use one of: {', '.join(TABLES)}.")
+
+    if path == "-":
+        if len(tables) != 1:
+            raise ValueError("Choose a single table to export to stdout.")
+        stream = stdout or sys.stdout
+        counts = {tables[0]: export_table(tables[0], stream, format, details, batch_size)}
+        stream.flush()
+        return counts
+
+    os.makedirs(path, exist_ok=True)
+    counts = {}
+    for table in tables:
+        with open(os.path.join(path, f"{table}.{format}"), "w", newline="", encoding="utf-8") as f:
+            counts[table] = export_table(table, f, format, details, batch_size)
+    return counts
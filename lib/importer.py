@@ -0,0 +1,231 @@
+# lib/importer.py
+"""Stream job applications from a CSV or JSONL file into the database.
+
+    python lib/main.py import --path applications.csv
+    python lib/main.py import --path applications.jsonl --rejects bad.jsonl
+
+Each record needs job_title, date_applied, status and a company, given by name
+(company) or id (company_id); description and last_follow_up are optional.
+Company names are matched exactly against a map built once at the start, and
+companies that don't exist yet are created in bulk. Records are validated and
+written batch_size at a time, each batch in one JobApplication.bulk_insert, so
+memory stays flat however large the file is. Rejected records are written to a
+side file in the input's format with _line and _reason fields added.
+"""
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+from models import insert_many, iter_rows, parse_date
+from models.company import Company
+from models.job_application import JobApplication
+
+FORMATS = ("csv", "jsonl")
+JOB_COLUMNS = ("job_title", "company_id", "description", "date_applied", "last_follow_up", "status")
+
+
+def detect_format(path, format=None):
+    """Return format, or guess it from the file extension (default jsonl)."""
+    if format:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown import format '{format}'. Use one of: {', '.join(FORMATS)}.")
+        return format
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(stream, format):
+    """Yield (line number, record dict or None, error) for each input record."""
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            if None in record:
+                yield reader.line_num, record, "more fields than the header"
+            else:
+                yield reader.line_num, record, None
+        return
+
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, {"_raw": line.rstrip("\n")}, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, {"_raw": line.rstrip("\n")}, "not a JSON object"
+        else:
+            yield number, record, None
+
+
+class RejectWriter:
+    """Write rejected records, with their line number and reason, in the input's format.
+
+    The file is only created once there is something to write.
+    """
+
+    def __init__(self, path, format):
+        self.path = path
+        self.format = format
+        self.count = 0
+        self._file = None
+        self._csv = None
+
+    def write(self, number, record, reason):
+        if self._file is None:
+            self._file = open(self.path, "w", newline="")
+        row = {key: value for key, value in record.items() if key is not None}
+        row["_line"] = number
+        row["_reason"] = reason
+        if self.format == "csv":
+            if self._csv is None:
+                self._csv = csv.DictWriter(self._file, fieldnames=list(row), extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row, default=str) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def company_directory():
+    """Return ({company name: id}, {ids}) for every company, read once."""
+    names, ids = {}, set()
+    for company_id, name in iter_rows("SELECT id, name FROM companies ORDER BY id"):
+        names.setdefault(name, company_id)
+        ids.add(company_id)
+    return names, ids
+
+
+def clean(value):
+    """Strip a text field, treating empty strings (and JSON null) as missing."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def validate(record):
+    """Return (row values for JOB_COLUMNS with the company as given, company name) or raise ValueError."""
+    job_title = clean(record.get("job_title"))
+    if not job_title:
+        raise ValueError("job_title is required")
+
+    company_name = clean(record.get("company") or record.get("company_name"))
+    company_id = clean(record.get("company_id"))
+    if company_id is not None:
+        if not company_id.isdigit():
+            raise ValueError(f"company_id '{company_id}' is not a number")
+        company_id = int(company_id)
+    elif not company_name:
+        raise ValueError("company or company_id is required")
+
+    status = (clean(record.get("status")) or "").lower()
+    if status not in JobApplication.VALID_STATUSES:
+        raise ValueError(f"status '{status}' must be one of: {', '.join(sorted(JobApplication.VALID_STATUSES))}")
+
+    date_applied = clean(record.get("date_applied"))
+    if not date_applied:
+        raise ValueError("date_applied is required")
+    try:
+        date_applied = parse_date(date_applied)
+    except ValueError:
+        raise ValueError(f"date_applied '{date_applied}' is not a YYYY-MM-DD date")
+
+    last_follow_up = clean(record.get("last_follow_up"))
+    if last_follow_up:
+        try:
+            last_follow_up = parse_date(last_follow_up)
+        except ValueError:
+            raise ValueError(f"last_follow_up '{last_follow_up}' is not a YYYY-MM-DD date")
+        if last_follow_up < date_applied:
+            raise ValueError("last_follow_up is before date_applied")
+
+    row = [job_title, company_id, clean(record.get("description")), date_applied, last_follow_up, status]
+    return row, company_name
+
+
+def import_jobs(path, format=None, rejects_path=None, batch_size=5000, create_companies=True):
+    """Import job applications from path ("-" for stdin). Returns a summary dict.
+
+    rejects_path defaults to the input path with ".rejects" before the
+    extension (or rejects.<format> for stdin).
+    """
+    format = detect_format(path, format)
+    if rejects_path is None:
+        base = "rejects" if path == "-" else os.path.splitext(path)[0] + ".rejects"
+        rejects_path = f"{base}.{format}"
+
+    names, ids = company_directory()
+    summary = {"imported": 0, "rejected": 0, "companies_created": 0, "rejects_file": None}
+    rejects = RejectWriter(rejects_path, format)
+    stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
+    try:
+        batch = []
+        for number, record, error in read_records(stream, format):
+            if error:
+                rejects.write(number, record, error)
+                continue
+            try:
+                row, company_name = validate(record)
+            except ValueError as e:
+                rejects.write(number, record, str(e))
+                continue
+            batch.append((number, record, row, company_name))
+            if len(batch) >= batch_size:
+                write_batch(batch, names, ids, rejects, summary, create_companies)
+                batch = []
+        write_batch(batch, names, ids, rejects, summary, create_companies)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        rejects.close()
+
+    summary["rejected"] = rejects.count
+    if rejects.count:
+        summary["rejects_file"] = rejects_path
+    return summary
+
+
+def write_batch(batch, names, ids, rejects, summary, create_companies):
+    """Resolve companies for one validated batch and insert it in a single transaction."""
+    if not batch:
+        return
+    # Missing companies are committed first rather than in an outer transaction
+    # around the insert, so a failed insert only has to retry its own rows.
+    missing = sorted({name for _, _, row, name in batch if row[1] is None and name not in names})
+    if missing and create_companies:
+        for name, company in zip(missing, Company.save_many(Company(name=name) for name in missing)):
+            names[name] = company.id
+            ids.add(company.id)
+        summary["companies_created"] += len(missing)
+
+    rows = []
+    for number, record, row, company_name in batch:
+        if row[1] is None:
+            row[1] = names.get(company_name)
+            if row[1] is None:
+                rejects.write(number, record, f"company '{company_name}' does not exist")
+                continue
+        elif row[1] not in ids:
+            rejects.write(number, record, f"company_id {row[1]} does not exist")
+            continue
+        rows.append((number, record, row))
+
+    try:
+        JobApplication.bulk_insert(JOB_COLUMNS, [row for _, _, row in rows])
+        summary["imported"] += len(rows)
+    except sqlite3.Error:
+        # Something validation didn't catch; find the offending rows one by one.
+        # Plain inserts here: the per-row triggers are cheaper than a batch of one.
+        for number, record, row in rows:
+            try:
+                insert_many("job_applications", JOB_COLUMNS, [row])
+                summary["imported"] += 1
+            except sqlite3.Error as e:
+                rejects.write(number, record, f"database error: {e}")
@@ -1,5 +1,16 @@
+import sys
 from cli import CLI
+from models import enable_tracing
+from models.migrations import migrate
 
 if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--trace"]
+    if len(args) < len(sys.argv) - 1:
+        enable_tracing()
+    migrate()
+    if args:
+        # Any other arguments are a scripted command; see batch.py.
+        import batch
+        sys.exit(batch.main(args))
     app = CLI()
-    app.start()
\ No newline at end of file
+    app.start()
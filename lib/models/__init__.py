@@ -1,6 +1,524 @@
+import os
+import re
 import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
 
-CONN = sqlite3.connect('lib/company.db')
-CURSOR = CONN.cursor()
+#! _______ CONNECTION FACTORY ___________
+# Nothing touches the database at import time. Each thread opens its own connection
+# the first time it uses CONN or CURSOR, from the path and PRAGMA profile below.
 
-print("Connected to the database:", CONN)
\ No newline at end of file
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "company.db")
+
+# Applied to every new connection, in this order. Override with configure() or
+# JOB_TRACKER_PRAGMAS="cache_size=-20000,synchronous=FULL".
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # negative means KiB, so about 64 MB of page cache
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,  # ms to wait on a lock held by another connection
+}
+
+_db_path = None
+
+
+def _env_pragmas():
+    pragmas = {}
+    for item in os.environ.get("JOB_TRACKER_PRAGMAS", "").split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            pragmas[name.strip()] = value.strip()
+    return pragmas
+
+
+PRAGMAS.update(_env_pragmas())
+
+
+def database_path():
+    """The database file in use: configure(path=...), then JOB_TRACKER_DB, then lib/company.db."""
+    return _db_path or os.environ.get("JOB_TRACKER_DB") or DEFAULT_DB_PATH
+
+
+def configure(path=None, **pragmas):
+    """Choose the database file and/or override PRAGMAs.
+
+    Every thread reconnects with the new settings on its next query.
+    """
+    global _db_path
+    if path is not None:
+        _db_path = path
+    PRAGMAS.update(pragmas)
+    pool.reset()
+
+
+def connect(path=None):
+    """Open a new connection to path (default: database_path()) with PRAGMAS applied."""
+    conn = sqlite3.connect(path or database_path(), detect_types=sqlite3.PARSE_DECLTYPES)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    if tracer.enabled:
+        tracer.install(conn)
+    return conn
+
+
+class ConnectionPool:
+    """Hands every thread its own connection to the same WAL database.
+
+    sqlite3 connections can't be shared between threads, but in WAL mode any
+    number of connections can read while one writes. write_lock makes sure only
+    one thread at a time is inside a write transaction.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.write_lock = threading.RLock()
+        self._generation = 0
+
+    def connection(self):
+        local = self.local
+        if getattr(local, "generation", None) != self._generation:
+            self.close()
+            local.connection = connect()
+            local.cursor = None
+            local.generation = self._generation
+        return local.connection
+
+    def cursor(self):
+        connection = self.connection()
+        if self.local.cursor is None:
+            self.local.cursor = connection.cursor()
+        return self.local.cursor
+
+    def close(self):
+        """Close the calling thread's connection; its next query opens a new one."""
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self.local.connection = None
+        self.local.cursor = None
+        self.local.generation = None
+
+    def reset(self):
+        """Make every thread reconnect on its next query."""
+        self._generation += 1
+        self.close()
+
+
+pool = ConnectionPool()
+
+
+def get_connection():
+    return pool.connection()
+
+
+def get_cursor():
+    return pool.cursor()
+
+
+def close():
+    """Close the calling thread's connection; the next query opens a fresh one."""
+    pool.close()
+
+
+#! _______ DATES ___________
+# DATE columns hold canonical ISO text ('YYYY-MM-DD', enforced by CHECK since
+# migration 7). date objects are written through the adapter and read back through
+# the converter, so the models only ever hold datetime.date values. There are
+# only a few thousand distinct days in use, so both parsers are cached.
+
+@lru_cache(maxsize=8192)
+def _parse_date_text(text):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        # Older rows may hold dates strptime accepted without zero padding.
+        return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def parse_date(value):
+    """Return value as a datetime.date, accepting a date, datetime or 'YYYY-MM-DD'.
+
+    Raises ValueError for anything else.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return _parse_date_text(value.strip())
+    raise ValueError(f"Invalid date: {value!r}")
+
+
+@lru_cache(maxsize=8192)
+def _convert_date(raw):
+    text = raw.decode()
+    try:
+        return _parse_date_text(text)
+    except ValueError:
+        return text  # unmigrated free-form text is handed back unchanged
+
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter("DATE", _convert_date)
+
+
+#! _______ QUERY TRACING ___________
+# Opt-in: JOB_TRACKER_TRACE=1, `main.py --trace` or enable_tracing(). Every
+# statement a connection runs is counted under the command active on its thread
+# (see trace_command), and repeated statements are reported as likely N+1 loops.
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Collapse a statement to its shape: literals become ?, IN lists become (...)."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PARAMETER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class CommandTrace:
+    """Statement counts, elapsed time and VM steps recorded for one command.
+
+    A statement's time runs from when SQLite starts it until the next statement
+    (or the end of the command) on the same thread, so it includes reading and
+    hydrating its rows. Work SQLite does on a statement's behalf (triggers, FTS
+    index writes) and the rows of one executemany count as that one statement.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.statements = {}  # normalized sql -> [count, seconds, vm steps]
+        self.batching = False  # inside an executemany (see QueryTracer.batch)
+        self._current = None
+        self._current_started = None
+        self._last_sql = None
+
+    @property
+    def statement_count(self):
+        return sum(stats[0] for stats in self.statements.values())
+
+    def record(self, sql):
+        # Sub-statements start with "--"; before Python 3.12 trigger steps are
+        # reported with their parent statement's text instead.
+        if sql.startswith("--") or sql == self._last_sql:
+            return
+        self._last_sql = sql
+        normalized = normalize_sql(sql)
+        if self.batching and normalized == self._current:
+            return
+        now = time.perf_counter()
+        self._finish_statement(now)
+        self.statements.setdefault(normalized, [0, 0.0, 0])[0] += 1
+        self._current = normalized
+        self._current_started = now
+
+    def progress(self, steps):
+        if self._current is not None:
+            self.statements[self._current][2] += steps
+
+    def finish(self):
+        now = time.perf_counter()
+        self._finish_statement(now)
+        self.elapsed = now - self.started
+
+    def repeated(self, limit):
+        """The statements that ran more than limit times, most frequent first."""
+        return sorted(
+            ((sql, stats[0]) for sql, stats in self.statements.items() if stats[0] > limit),
+            key=lambda item: -item[1]
+        )
+
+    def _finish_statement(self, now):
+        if self._current is not None:
+            self.statements[self._current][1] += now - self._current_started
+            self._current = None
+
+
+class QueryTracer:
+    """Hooks set_trace_callback/set_progress_handler on pooled connections and
+    groups what they run by command.
+    """
+
+    PROGRESS_STEPS = 1000
+
+    def __init__(self, repeat_limit=10, history=100):
+        self.enabled = False
+        self.repeat_limit = repeat_limit
+        self.commands = deque(maxlen=history)
+        self.output = sys.stderr
+        self.local = threading.local()
+
+    def install(self, conn):
+        conn.set_trace_callback(self._on_statement)
+        conn.set_progress_handler(self._on_progress, self.PROGRESS_STEPS)
+
+    def current(self):
+        trace = getattr(self.local, "trace", None)
+        if trace is None:
+            trace = self.local.trace = CommandTrace("(no command)")
+        return trace
+
+    def _on_statement(self, sql):
+        self.current().record(sql)
+
+    def _on_progress(self):
+        self.current().progress(self.PROGRESS_STEPS)
+        return 0
+
+    @contextmanager
+    def batch(self):
+        """Count the repeats of one statement inside the block (an executemany) once."""
+        if not self.enabled:
+            yield
+            return
+        trace = self.current()
+        trace.batching = True
+        try:
+            yield
+        finally:
+            trace.batching = False
+
+    @contextmanager
+    def command(self, name):
+        previous = getattr(self.local, "trace", None)
+        trace = self.local.trace = CommandTrace(name)
+        try:
+            yield trace
+        finally:
+            trace.finish()
+            self.local.trace = previous
+            self.commands.append(trace)
+            self.report(trace)
+
+    def report(self, trace):
+        print(f"[trace] {trace.name}: {trace.statement_count} statements "
+              f"({len(trace.statements)} distinct) in {trace.elapsed * 1000:.1f} ms", file=self.output)
+        for sql, count in trace.repeated(self.repeat_limit):
+            print(f"[trace] possible N+1 in '{trace.name}': ran {count} times: {sql}", file=self.output)
+
+
+tracer = QueryTracer(repeat_limit=int(os.environ.get("JOB_TRACKER_TRACE_LIMIT", 10)))
+
+
+def enable_tracing(repeat_limit=None):
+    """Start tracing statements on every connection, including ones already open."""
+    if repeat_limit is not None:
+        tracer.repeat_limit = repeat_limit
+    tracer.enabled = True
+    pool.reset()
+
+
+@contextmanager
+def trace_command(name):
+    """Group the statements run inside the block under name. Does nothing
+    unless tracing is enabled.
+    """
+    if not tracer.enabled:
+        yield None
+        return
+    with tracer.command(name) as trace:
+        yield trace
+
+
+class _LazyProxy:
+    """Forwards attribute access to the object returned by factory(), so CONN and
+    CURSOR can be imported before a connection exists.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+    def __repr__(self):
+        return f"<lazy {self._factory.__name__}()>"
+
+
+CONN = _LazyProxy(get_connection)
+CURSOR = _LazyProxy(get_cursor)
+
+if os.environ.get("JOB_TRACKER_TRACE"):
+    enable_tracing()
+
+
+def chunked(values, size=900):
+    """Split values into lists short enough to bind as SQL parameters."""
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def iter_rows(sql, params=(), batch_size=500, row_factory=None):
+    """Yield the rows of a query batch_size at a time.
+
+    The query runs on a cursor of its own, so the shared CURSOR stays free for
+    other statements while the caller works through the results. row_factory,
+    if given, builds each row (see models/views.py).
+    """
+    cursor = CONN.cursor()
+    cursor.row_factory = row_factory
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def fetch_all(sql, params=(), row_factory=None):
+    """Return every row of a query, built by row_factory if one is given."""
+    cursor = CONN.cursor()
+    cursor.row_factory = row_factory
+    try:
+        return cursor.execute(sql, params).fetchall()
+    finally:
+        cursor.close()
+
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+def export_query(stream, columns, source, format="jsonl", batch_size=1000):
+    """Write `SELECT <columns> FROM <source>` to stream as CSV or JSON lines.
+
+    columns is a sequence of (field name, SQL expression) pairs and source is
+    everything after FROM (joins, GROUP BY, ORDER BY). SQLite renders each line
+    itself, with json_object() or as comma-joined text, so Python only copies
+    finished text from fetchmany batches to the stream. CSV output starts with
+    a header row, quotes every text value and leaves NULL as an empty field.
+    Returns the number of rows written.
+    """
+    if format == "csv":
+        stream.write(",".join(name for name, _ in columns) + "\n")
+        line = " || ',' || ".join(
+            f"""iif(typeof({expression}) = 'text', '"' || replace({expression}, '"', '""') || '"', coalesce({expression}, ''))"""
+            for _, expression in columns
+        )
+    elif format == "jsonl":
+        line = "json_object(" + ", ".join(f"'{name}', {expression}" for name, expression in columns) + ")"
+    else:
+        raise ValueError(f"Unknown export format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+
+    count = 0
+    cursor = CONN.cursor()
+    try:
+        cursor.execute(f"SELECT {line} FROM {source}")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            stream.write("\n".join(row[0] for row in rows))
+            stream.write("\n")
+            count += len(rows)
+    finally:
+        cursor.close()
+    return count
+
+
+def insert_many(table, columns, rows):
+    """Insert rows into table with one executemany in a single transaction.
+
+    Returns the new ids in the same order as rows. AUTOINCREMENT hands out
+    consecutive ids while this connection holds the write lock, so they are
+    worked out from the last one. Any failure rolls back the whole batch (or
+    its savepoint inside an outer transaction()) and is re-raised.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    with transaction():
+        with tracer.batch():
+            CURSOR.executemany(sql, rows)
+        last_id = CURSOR.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+def in_transaction():
+    """True inside a transaction() block on the calling thread.
+
+    Model methods that report their own errors re-raise them here instead, so
+    the enclosing block sees the failure and rolls back.
+    """
+    return getattr(pool.local, "depth", 0) > 0
+
+
+@contextmanager
+def transaction():
+    """Run the model writes inside the block as one atomic unit.
+
+    The outermost block takes the pool's write lock, opens a transaction and
+    commits once on exit; nested blocks become savepoints, so an inner failure
+    only undoes its own work. An exception rolls back to where the block
+    started and is re-raised. Outside any block each save/update/delete still
+    commits on its own and reports its errors itself; inside one they raise
+    (see in_transaction), so a failure anywhere undoes the whole block.
+
+        with transaction():
+            company.add_job_application(job)
+            job.add_tag(tag.id)
+    """
+    from models.identity_map import identity_map
+
+    depth = getattr(pool.local, "depth", 0)
+    savepoint = f"sp_{depth}" if depth else None
+    if savepoint:
+        CONN.execute(f"SAVEPOINT {savepoint}")
+    else:
+        pool.write_lock.acquire()
+        try:
+            if CONN.in_transaction:
+                CONN.commit()
+            CONN.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            pool.write_lock.release()
+            raise
+    pool.local.depth = depth + 1
+    try:
+        yield CONN
+    except BaseException:
+        pool.local.depth = depth
+        try:
+            if savepoint:
+                CONN.execute(f"ROLLBACK TO {savepoint}")
+                CONN.execute(f"RELEASE {savepoint}")
+            else:
+                CONN.rollback()
+        finally:
+            if not savepoint:
+                pool.write_lock.release()
+        # Cached objects may hold state that was just rolled back.
+        identity_map.clear()
+        raise
+    else:
+        pool.local.depth = depth
+        if savepoint:
+            CONN.execute(f"RELEASE {savepoint}")
+        else:
+            try:
+                CONN.commit()
+            except BaseException:
+                CONN.rollback()
+                identity_map.clear()
+                raise
+            finally:
+                pool.write_lock.release()
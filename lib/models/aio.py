@@ -0,0 +1,63 @@
+import os
+import threading
+from functools import partial
+
+#! _______ ASYNCIO BRIDGE ___________
+# The models block on sqlite3, so the async methods hand the blocking call to a
+# thread and await it. Each worker thread gets its own connection from the pool in
+# models/__init__.py. Reads share a bounded pool and run in parallel. Writes go
+# through a single worker, so they queue up instead of tying up read workers
+# while they wait for the write lock. asyncio and concurrent.futures are imported
+# on first use to keep them out of CLI startup. Before each call the worker syncs
+# the identity map, so objects other connections have changed aren't served.
+
+READ_WORKERS = int(os.environ.get("JOB_TRACKER_ASYNC_READERS", 4))
+
+_read_executor = None
+_write_executor = None
+_executor_lock = threading.Lock()
+
+
+def _executors():
+    global _read_executor, _write_executor
+    from concurrent.futures import ThreadPoolExecutor
+
+    with _executor_lock:
+        if _read_executor is None:
+            _read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="job-tracker-read")
+            _write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-tracker-write")
+    return _read_executor, _write_executor
+
+
+def _synced(func, *args, **kwargs):
+    from models import get_connection
+    from models.identity_map import identity_map
+
+    identity_map.sync(get_connection())
+    return func(*args, **kwargs)
+
+
+async def read(func, *args, **kwargs):
+    """Await func(*args, **kwargs) on the read pool."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executors()[0], partial(_synced, func, *args, **kwargs))
+
+
+async def write(func, *args, **kwargs):
+    """Await func(*args, **kwargs) on the single writer thread."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executors()[1], partial(_synced, func, *args, **kwargs))
+
+
+def shutdown(wait=True):
+    """Stop the worker threads. New async calls start fresh ones."""
+    global _read_executor, _write_executor
+    with _executor_lock:
+        for executor in (_read_executor, _write_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        _read_executor = _write_executor = None
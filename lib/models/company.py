@@ -1,6 +1,8 @@
-from models import CONN, CURSOR
+from models import CURSOR, export_query, fetch_all, in_transaction, iter_rows, insert_many, transaction
+from models import aio
+from models.identity_map import identity_map
+from models.views import CompanyRow
 import sqlite3
-import ipdb
 
 class Company:
     def __init__(self, name, website=None, contact_info=None, id=None):
@@ -43,31 +45,82 @@ class Company:
     @classmethod
     def create_table(cls):
         try:
-            CURSOR.execute("""
-            CREATE TABLE IF NOT EXISTS companies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL CHECK(LENGTH(name) > 0),
-                website TEXT,
-                contact_info TEXT
-            )
-            """)
+            with transaction():
+                CURSOR.execute("""
+                CREATE TABLE IF NOT EXISTS companies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL CHECK(LENGTH(name) > 0),
+                    website TEXT,
+                    contact_info TEXT
+                )
+                """)
 
             return ("Table 'companies' created successfully.")
         except sqlite3.Error as e:
             return (f"An error occurred while creating the table: {e}")
+
+    #! build a company from a stored row
+    @classmethod
+    def instance_from_db(cls, row):
+        """Build a Company from a database row, skipping the setter validation
+        the row already passed when it was saved.
+        """
+        company = identity_map.get(cls, row[0]) or cls.__new__(cls)
+        company.id = row[0]
+        company._name = row[1]
+        company._website = row[2]
+        company._contact_info = row[3]
+        return identity_map.add(company)
+
     #! retrieve all companies from the database
     @classmethod
-    def get_all(cls):
-        """Retrieve all companies from the database."""
+    def get_all(cls, view=False):
+        """Retrieve all companies from the database, as CompanyRow views if view is true."""
         try:
+            if view:
+                return fetch_all("SELECT * FROM companies", row_factory=CompanyRow.row_factory)
             CURSOR.execute("SELECT * FROM companies")
-            return [cls(id=row[0], name=row[1], website=row[2], contact_info=row[3]) for row in CURSOR.fetchall()]
+            return [cls.instance_from_db(row) for row in CURSOR.fetchall()]
         except sqlite3.Error as e: 
             return(f"An error occurred while retrieving companies: {e}")
             
         except Exception as e: # the most general 
             return e
         #add another except 
+
+    #! stream companies without loading them all at once
+    @classmethod
+    def iter_all(cls, batch_size=500, view=False):
+        """Yield every company lazily, fetching batch_size rows at a time."""
+        rows = iter_rows("SELECT * FROM companies", batch_size=batch_size,
+                         row_factory=CompanyRow.row_factory if view else None)
+        yield from rows if view else map(cls.instance_from_db, rows)
+
+    @classmethod
+    def export(cls, stream, format="jsonl", batch_size=1000):
+        """Stream every company to stream as CSV or JSON lines (see models.export_query)."""
+        columns = [(name, name) for name in ("id", "name", "website", "contact_info")]
+        return export_query(stream, columns, "companies ORDER BY id", format, batch_size)
+
+    #! one keyset page of companies
+    @classmethod
+    def get_page(cls, after_id=0, limit=20, before_id=None, view=False):
+        """Return the companies after after_id (or before before_id) in id order,
+        as CompanyRow views if view is true.
+        """
+        factory = CompanyRow.row_factory if view else None
+        try:
+            if before_id is not None:
+                rows = fetch_all("SELECT * FROM companies WHERE id < ? ORDER BY id DESC LIMIT ?",
+                                 (before_id, limit), factory)[::-1]
+            else:
+                rows = fetch_all("SELECT * FROM companies WHERE id > ? ORDER BY id LIMIT ?",
+                                 (after_id, limit), factory)
+            return rows if view else [cls.instance_from_db(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"An error occurred while retrieving companies: {e}")
+            return []
+
     #! find company by name
     @classmethod
     def find_by_name(cls, name):
@@ -76,7 +129,7 @@ class Company:
             CURSOR.execute("SELECT * FROM companies WHERE name = ?", (name,))
             row = CURSOR.fetchone()
             if row:
-                return cls(id=row[0], name=row[1], website=row[2], contact_info=row[3])
+                return cls.instance_from_db(row)
 
         except sqlite3.Error as e:
             return(f"An error occurred while finding the company: {e}")
@@ -87,13 +140,16 @@ class Company:
     @classmethod #add validation
     def find_by_id(cls, company_id):
         """Find a company by ID."""
+        cached = identity_map.get(cls, company_id)
+        if cached:
+            return cached
         try:
             CURSOR.execute("SELECT * FROM companies WHERE id = ?", (company_id,))
             
             row = CURSOR.fetchone()
             
             if row:
-                return cls(id=row[0], name=row[1], website=row[2], contact_info=row[3])
+                return cls.instance_from_db(row)
 
         except sqlite3.Error as e:
             return(f"An error occurred while finding the company: {e}")
@@ -114,47 +170,108 @@ class Company:
     def save(self):
         """Save a new company to the database."""
         try:
-            CURSOR.execute("INSERT INTO companies (name, website, contact_info) VALUES (?, ?, ?)",
-            (self.name, self.website, self.contact_info))
-            CONN.commit()
-            self.id = CURSOR.lastrowid  #! set the object's ID after insertion to match the database record
+            with transaction():
+                CURSOR.execute("INSERT INTO companies (name, website, contact_info) VALUES (?, ?, ?)",
+                (self.name, self.website, self.contact_info))
+                self.id = CURSOR.lastrowid  #! set the object's ID after insertion to match the database record
+            identity_map.add(self)
             return self
         except sqlite3.Error as e:
-            CONN.rollback() # add to every changing method
+            if in_transaction():
+                raise
             return(f"An error occurred while saving the company: {e}")
 
+#! save a batch of new companies in one transaction
+    @classmethod
+    def save_many(cls, companies):
+        """Insert new companies with a single executemany in one transaction.
+
+        Every object is checked before anything is written and ids are assigned
+        back in order. If any row fails the whole batch is rolled back and the
+        sqlite3 error is raised.
+        """
+        companies = list(companies)
+        for company in companies:
+            if not isinstance(company, cls):
+                raise TypeError("save_many only accepts Company instances.")
+            if company.id is not None:
+                raise ValueError(f"Company '{company.name}' is already saved with ID {company.id}.")
+
+        ids = insert_many(
+            "companies",
+            ("name", "website", "contact_info"),
+            ((company.name, company.website, company.contact_info) for company in companies)
+        )
+        for company, id in zip(companies, ids):
+            company.id = id
+            identity_map.add(company)
+        return companies
+
      #! uppdate an existing company
     def update(self):
         if self.id is None:
             print("Company must have an ID before updating.")
             return
         try:
-            CURSOR.execute("UPDATE companies SET name = ?, website = ?, contact_info = ? WHERE id = ?",
-                           (self.name, self.website, self.contact_info, self.id))
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("UPDATE companies SET name = ?, website = ?, contact_info = ? WHERE id = ?",
+                               (self.name, self.website, self.contact_info, self.id))
+            identity_map.add(self)
             return(f"Company '{self.name}' updated successfully.")
         except sqlite3.Error as e:
-            CONN.rollback()
+            if in_transaction():
+                raise
             return(f"An error occurred while updating the company: {e}")
+
+    #! delete a company
+    def delete(self):
+        """Delete the company and forget its cached job applications, including
+        any prefetched on its tags.
+        """
+        from models.job_application import JobApplication
+        from models.job_application_tag import JobApplicationTag
+        try:
+            with transaction():
+                CURSOR.execute("DELETE FROM companies WHERE id = ?", (self.id,))
+            identity_map.remove(Company, self.id)
+            identity_map.remove_where(JobApplication, lambda job: job.company_id == self.id)
+            JobApplicationTag._forget_deleted(company_id=self.id)
+            return(f"Company '{self.name}' deleted successfully.")
+        except sqlite3.Error as e:
+            if in_transaction():
+                raise
+            return(f"An error occurred while deleting the company: {e}")
         
+    #! companies with the most applications, read from the job_counts summary
     @classmethod
-    def find_top_two_companies(cls):
-         
+    def top_n(cls, n, status=None):
+        """Return up to n (company, application count) pairs, most applications first.
+
+        With status, only applications in that status are counted. The counts are
+        kept by triggers (see migrations.job_counts_table), so this reads n index
+        entries instead of grouping job_applications.
+        """
         try:
             CURSOR.execute("""
-                SELECT company_id
-                FROM job_applications
-                JOIN companies ON job_applications.company_id = companies.id
-                GROUP BY company_id
-                ORDER BY COUNT(*) DESC
-                LIMIT 2
-            """)
-            rows = CURSOR.fetchall() #list of tuples
+            SELECT companies.*, job_counts.applications
+            FROM job_counts JOIN companies ON companies.id = job_counts.company_id
+            WHERE job_counts.status = ? AND job_counts.company_id != 0
+            ORDER BY job_counts.applications DESC, job_counts.company_id
+            LIMIT ?
+            """, (status or "", n))
+            return [(cls.instance_from_db(row), row[-1]) for row in CURSOR.fetchall()]
+        except sqlite3.Error as e:
+            print(f"An error occurred while ranking companies: {e}")
+            return []
 
+    @classmethod
+    def find_top_two_companies(cls):
+        try:
             return [{
-                "company_id": row[0],
-                "company_name": row[1],
-            } for row in rows]
+                "company_id": company.id,
+                "company_name": company.name,
+                "applications": applications,
+            } for company, applications in cls.top_n(2)]
         
         except Exception as e:
             return e
@@ -171,11 +288,11 @@ class Company:
         """get all columns from job_applications that match the id of the company instance and filter rows
         where the company.id matches the given value
         """
+        from models.job_application import JobApplication
         try:
             CURSOR.execute("SELECT * FROM job_applications WHERE company_id = ?",  (self.id,))
             job_applications = CURSOR.fetchall()
-            return [JobApplication(job_title=row[1], company_id=row[2], description=row[3],
-                   date_applied=row[4], last_follow_up=row[5], status=row[6], id=row[0]) for row in job_applications]
+            return [JobApplication.instance_from_db(row) for row in job_applications]
         except sqlite3.Error as e:
             return f"An error occurred while retrieving job applications for company {e}"
 
@@ -184,6 +301,7 @@ class Company:
         """associates a given JobApplication instance with the current company by setting
         the company's ID on the job application and saving it to the database.
         """
+        from models.job_application import JobApplication
 
         if not isinstance(job_application, JobApplication):
             raise TypeError("Provided object must be a JobApplication instance")
@@ -192,6 +310,8 @@ class Company:
             job_application.save()
             return f"Job application '{job_application.job_title}' successfully associated with company '{self.name}'."
         except Exception as e:
+            if in_transaction():
+                raise
             return f"An error occurred while associating the job application: {e}"
 
 
@@ -199,9 +319,36 @@ class Company:
     def drop_table(cls):
             #!drop the companies table.
         try:
-            CURSOR.execute("DROP TABLE IF EXISTS companies")
+            with transaction():
+                CURSOR.execute("DROP TABLE IF EXISTS companies")
             return("Table 'companies' dropped successfully.")
         except sqlite3.Error as e:
             return(f"An error occurred while dropping the table: {e}")
 
-from models.job_application import JobApplication
\ No newline at end of file
+#! async counterparts for use from an asyncio event loop
+    @classmethod
+    async def afind_by_id(cls, company_id):
+        return await aio.read(cls.find_by_id, company_id)
+
+    @classmethod
+    async def atop_n(cls, n, status=None):
+        return await aio.read(cls.top_n, n, status)
+
+    @classmethod
+    async def afind_by_name(cls, name):
+        return await aio.read(cls.find_by_name, name)
+
+    @classmethod
+    async def aget_all(cls, view=False):
+        return await aio.read(cls.get_all, view)
+
+    @classmethod
+    async def aget_page(cls, after_id=0, limit=20, before_id=None, view=False):
+        return await aio.read(cls.get_page, after_id, limit, before_id, view)
+
+    async def asave(self):
+        return await aio.write(self.save)
+
+    @classmethod
+    async def asave_many(cls, companies):
+        return await aio.write(cls.save_many, list(companies))
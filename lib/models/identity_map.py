@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class IdentityMap:
+    """Session cache that keeps one live model instance per (class, id).
+
+    Lookups that hit the map are served from memory and always hand back the same
+    object for a given row. The least recently used entries are evicted once the
+    map holds more than max_size objects.
+
+    Each thread has a map of its own, like its own connection: an object saved
+    inside another thread's still-open transaction is never handed out here,
+    and no two threads share (and rewrite) one instance.
+
+    Objects are only as fresh as the last write made through them, so the map
+    is scoped: the CLI clears it before every command, a rolled-back
+    transaction() clears it, and the async methods call sync() before each
+    call to drop it once any other connection has committed.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._local = threading.local()
+
+    @property
+    def _objects(self):
+        objects = getattr(self._local, "objects", None)
+        if objects is None:
+            objects = self._local.objects = OrderedDict()
+        return objects
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, cls, id):
+        """Return the live instance for (cls, id), or None if it isn't cached."""
+        key = (cls, id)
+        obj = self._objects.get(key)
+        if obj is not None:
+            self._objects.move_to_end(key)
+        return obj
+
+    def add(self, obj):
+        """Register a saved instance as the live object for its row."""
+        if obj.id is None:
+            return obj
+        key = (type(obj), obj.id)
+        self._objects[key] = obj
+        self._objects.move_to_end(key)
+        self._evict()
+        return obj
+
+    def remove(self, cls, id):
+        """Drop the cached instance for (cls, id), if any."""
+        self._objects.pop((cls, id), None)
+
+    def remove_where(self, cls, predicate):
+        """Drop every cached instance of cls for which predicate(obj) is true."""
+        objects = self._objects
+        for key in [key for key, obj in objects.items() if key[0] is cls and predicate(obj)]:
+            del objects[key]
+
+    def instances(self, cls):
+        """A list of the cached instances of cls."""
+        return [obj for key, obj in self._objects.items() if key[0] is cls]
+
+    def resize(self, max_size):
+        """Change the LRU size limit, evicting straight away if it shrank."""
+        self.max_size = max_size
+        self._evict()
+
+    def clear(self):
+        """Empty the calling thread's map."""
+        self._objects.clear()
+
+    def sync(self, connection):
+        """Clear the map if the database changed since the calling thread last
+        synced on connection: another thread, process or the sqlite3 shell
+        committed, and cached objects may be stale. PRAGMA data_version only
+        moves for other connections' commits, so this is one cheap read.
+        """
+        version = connection.execute("PRAGMA data_version").fetchone()[0]
+        # The connection itself, not its id(): a new connection (after configure()
+        # or close()) can reuse a closed one's address and restart data_version.
+        if getattr(self._local, "connection", None) is not connection or self._local.version != version:
+            self._local.connection = connection
+            self._local.version = version
+            self.clear()
+
+    def _evict(self):
+        objects = self._objects
+        while len(objects) > self.max_size:
+            objects.popitem(last=False)
+
+
+identity_map = IdentityMap(int(os.environ.get("JOB_TRACKER_IDENTITY_MAP_SIZE", 10000)))
@@ -1,12 +1,21 @@
-from models import CONN, CURSOR
+from models import CURSOR, chunked, export_query, fetch_all, in_transaction, iter_rows, insert_many, parse_date, transaction
+from models import aio
+from models.identity_map import identity_map
+from models.views import JobApplicationRow
 from models.company import Company
 from models.job_application_tag import JobApplicationTag
+import heapq
 import sqlite3
-import ipdb
-from datetime import datetime, date
+from datetime import date, timedelta
+from itertools import islice
 
 class JobApplication:
     VALID_STATUSES = {'applied', 'pending', 'rejected', 'offer'}
+    # Order the stages appear in the status funnel.
+    FUNNEL = ('applied', 'pending', 'offer', 'rejected')
+    # Days after the last contact (the last follow-up, or applying) before an
+    # application at each status is due a follow-up. Rejected ones never are.
+    FOLLOW_UP_DAYS = {'applied': 7, 'pending': 5, 'offer': 2}
 
     def __init__(self, job_title, company_id, description, date_applied, last_follow_up, status, id=None):
         self.id = id
@@ -22,34 +31,66 @@ class JobApplication:
             try:
                 from models.job_application_tag import JobApplicationTag
                 CURSOR.execute("""
-                SELECT * FROM job_application_tags WHERE tag_id == ?
+                SELECT * FROM job_application_tags WHERE job_id == ?
                 """, (self.id,))
                 job_app_tags = CURSOR.fetchall()
                 return [
-                    JobApplicationTag(id=job_app_tag[0], job_id=job_app_tag[1], tag_id=job_app_tag[2])
+                    JobApplicationTag.instance_from_db(job_app_tag)
                     for job_app_tag in job_app_tags
                 ]
             except Exception as e:
-                return(f"Error retrieving job applications for tag {self.id}: {e}")
-    
-    def job_applications(self):
+                return(f"Error retrieving tags for job application {self.id}: {e}")
+
+    def tags(self):
+        """Return the tags assigned to this job application in a single JOIN query."""
+        prefetched = getattr(self, "_tags", None)
+        if prefetched is not None:
+            return prefetched
         try:
-            from models.job_application_tag import JobApplicationTag
-            return [
-                job_app_tag.job_application() for job_app_tag in self.job_application_tags()
-            ]
+            from models.tag import Tag
+            CURSOR.execute("""
+            SELECT tags.* FROM tags
+            JOIN job_application_tags ON job_application_tags.tag_id = tags.id
+            WHERE job_application_tags.job_id = ?
+            """, (self.id,))
+            return [Tag.instance_from_db(row) for row in CURSOR.fetchall()]
         except Exception as e:
-            return(f"Error retrieving job applications for tag {self.id}: {e}")
+            return(f"Error retrieving tags for job application {self.id}: {e}")
+
+    @classmethod
+    def prefetch_tags(cls, jobs):
+        """Load the tags for every job in jobs with one query per 900 jobs and
+        cache them, so each job.tags() is a memory read.
+        """
+        from models.tag import Tag
+        by_id = {job.id: job for job in jobs}
+        for job in by_id.values():
+            job._tags = []
+        for ids in chunked(by_id):
+            CURSOR.execute(f"""
+            SELECT job_application_tags.job_id, tags.* FROM tags
+            JOIN job_application_tags ON job_application_tags.tag_id = tags.id
+            WHERE job_application_tags.job_id IN ({", ".join("?" * len(ids))})
+            """, ids)
+            for row in CURSOR.fetchall():
+                by_id[row[0]]._tags.append(Tag.instance_from_db(row[1:]))
+        return jobs
         
     
     def add_tag(self, tag_id):
-        """Associates the job with a tag and handles errors."""
+        """Associates the job with a tag and handles errors. Returns the new
+        JobApplicationTag, or None if the tag wasn't assigned.
+        """
         try:
             from models.job_application_tag import JobApplicationTag
 
-            JobApplicationTag.create(self.id, tag_id)
-            print(f"Tag {tag_id} successfully assigned to job {self.id}.")
+            job_tag = JobApplicationTag.create(self.id, tag_id)
+            if job_tag is not None and job_tag.id is not None:
+                print(f"Tag {tag_id} successfully assigned to job {self.id}.")
+                return job_tag
         except ValueError as e:
+            if in_transaction():
+                raise
             print(f"Error: {e}")
 
 
@@ -64,7 +105,7 @@ class JobApplication:
                 raise ValueError(f"Invalid company_id {value}. It must be a positive integer or None.")
             if not Company.find_by_id(value):  # Check if company exists in DB
                 raise ValueError(f"Company with ID {value} does not exist.")
-            self._company_id = value
+        self._company_id = value
 
     @property
     def status(self):
@@ -82,9 +123,10 @@ class JobApplication:
 
     @date_applied.setter
     def date_applied(self, value):
-        if not self._validate_date(value):
+        parsed = self._validate_date(value)
+        if parsed is None:
             raise ValueError(f"Invalid date format: {value}. Use YYYY-MM-DD.")
-        self._date_applied = value
+        self._date_applied = parsed
 
     @property
     def last_follow_up(self):
@@ -92,65 +134,161 @@ class JobApplication:
 
     @last_follow_up.setter
     def last_follow_up(self, value):
-        if value is not None and not self._validate_date(value):
+        if value is None:
+            self._last_follow_up = None
+            return
+        parsed = self._validate_date(value)
+        if parsed is None:
             raise ValueError(f"Invalid date format: {value}. Use YYYY-MM-DD or leave empty.")
-        self._last_follow_up = value
+        self._last_follow_up = parsed
 
     def _validate_date(self, date_value):
-        """Check if the date is in YYYY-MM-DD format and valid."""
-        if isinstance(date_value, date):
-            return True  # Already a valid date object
+        """Return date_value as a date if it is a date or a valid YYYY-MM-DD string, else None."""
         try:
-            datetime.strptime(date_value, "%Y-%m-%d")
-            return True
+            return parse_date(date_value)
         except ValueError:
-            return False
+            return None
     
 
     @classmethod
     def create_table(cls):
         """Create the job_applications table."""
         try:
-            CURSOR.execute("""
-            CREATE TABLE IF NOT EXISTS job_applications (
-                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_title TEXT NOT NULL,
-                company_id INTEGER,
-                description TEXT,
-                date_applied DATE,
-                last_follow_up DATE,
-                status TEXT CHECK(status IN ('applied', 'pending', 'rejected', 'offer')),
-                FOREIGN KEY (company_id) REFERENCES companies(company_id) ON DELETE cascade
-            )
-            """)
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("""
+                CREATE TABLE IF NOT EXISTS job_applications (
+                    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_title TEXT NOT NULL,
+                    company_id INTEGER,
+                    description TEXT,
+                    date_applied DATE CHECK(date_applied IS NULL OR date(date_applied) IS date_applied),
+                    last_follow_up DATE CHECK(last_follow_up IS NULL OR date(last_follow_up) IS last_follow_up),
+                    status TEXT CHECK(status IN ('applied', 'pending', 'rejected', 'offer')),
+                    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+                )
+                """)
             print("Table 'job_applications' created successfully.")
         except sqlite3.Error as e:
             print(f"An error occurred while creating the table: {e}")
 
+    @classmethod
+    def instance_from_db(cls, row):
+        """Build a JobApplication from a database row.
+
+        Rows read back from the table were validated when they were saved, so this
+        skips the setters (and the Company lookup behind company_id) entirely.
+        """
+        job = identity_map.get(cls, row[0]) or cls.__new__(cls)
+        job.id = row[0]
+        job.job_title = row[1]
+        job._company_id = row[2]
+        job.description = row[3]
+        job._date_applied = row[4]
+        job._last_follow_up = row[5]
+        job._status = row[6]
+        return identity_map.add(job)
+
 
     def save(self):
         """Save a new job application to the database."""
         try:
-            CURSOR.execute("""
-            INSERT INTO job_applications (job_title, company_id, description, date_applied, last_follow_up, status)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """, (self.job_title, self.company_id, self.description, self.date_applied, self.last_follow_up, self.status))
-            CONN.commit()  
+            with transaction():
+                CURSOR.execute("""
+                INSERT INTO job_applications (job_title, company_id, description, date_applied, last_follow_up, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """, (self.job_title, self.company_id, self.description, self.date_applied, self.last_follow_up, self.status))
             self.id = CURSOR.lastrowid
+            identity_map.add(self)
             print(f"Job application '{self.job_title}' saved successfully with ID {self.id}.")
         except sqlite3.IntegrityError as e:
+            if in_transaction():
+                raise
             print(f"Integrity error occurred while saving job application: {e}")
         except sqlite3.Error as e:
+            if in_transaction():
+                raise
             print(f"An error occurred while saving job application: {e}")
 
+
+    @classmethod
+    def save_many(cls, jobs):
+        """Insert new job applications with a single executemany in one transaction.
+
+        Every object is checked before anything is written and ids are assigned
+        back in order. If any row fails the whole batch is rolled back and the
+        sqlite3 error is raised.
+        """
+        jobs = list(jobs)
+        for job in jobs:
+            if not isinstance(job, cls):
+                raise TypeError("save_many only accepts JobApplication instances.")
+            if job.id is not None:
+                raise ValueError(f"Job application '{job.job_title}' is already saved with ID {job.id}.")
+            if not isinstance(job.job_title, str) or not job.job_title.strip():
+                raise ValueError("Job title must be a non-empty string.")
+
+        ids = cls.bulk_insert(
+            ("job_title", "company_id", "description", "date_applied", "last_follow_up", "status"),
+            (
+                (job.job_title, job.company_id, job.description, job.date_applied, job.last_follow_up, job.status)
+                for job in jobs
+            )
+        )
+        for job, id in zip(jobs, ids):
+            job.id = id
+            identity_map.add(job)
+        return jobs
+
+    @classmethod
+    def bulk_insert(cls, columns, rows):
+        """insert_many into job_applications, updating job_search and job_counts
+        once for the whole batch rather than through their per-row triggers.
+
+        Firing those triggers costs about as much as the insert itself, so for
+        the length of the batch's write transaction a row in job_bulk_insert
+        switches them off (see migration 11); then one INSERT ... SELECT indexes
+        the new id range and one upsert adds its counts. No other connection
+        ever sees the switch. Returns the new ids in order; any failure rolls
+        back the whole batch and is raised.
+        """
+        with transaction():
+            CURSOR.execute("INSERT INTO job_bulk_insert (active) VALUES (1)")
+            ids = insert_many("job_applications", columns, rows)
+            CURSOR.execute("DELETE FROM job_bulk_insert")
+            if ids:
+                CURSOR.execute("""
+                INSERT INTO job_search (rowid, job_title, description, company_name)
+                SELECT j.job_id, j.job_title, j.description, c.name
+                FROM job_applications j LEFT JOIN companies c ON c.id = j.company_id
+                WHERE j.job_id BETWEEN ? AND ?
+                """, (ids[0], ids[-1]))
+                CURSOR.execute("""
+                WITH batch AS (
+                    SELECT company_id, status FROM job_applications WHERE job_id BETWEEN ? AND ?
+                )
+                INSERT INTO job_counts (company_id, status, applications)
+                SELECT company_id, status, count(*) FROM (
+                    SELECT company_id, status FROM batch
+                    UNION ALL SELECT company_id, '' FROM batch
+                    UNION ALL SELECT 0, status FROM batch
+                    UNION ALL SELECT 0, '' FROM batch
+                )
+                WHERE company_id IS NOT NULL AND status IS NOT NULL
+                GROUP BY company_id, status
+                ON CONFLICT (company_id, status) DO UPDATE SET applications = applications + excluded.applications
+                """, (ids[0], ids[-1]))
+        return ids
     
     @classmethod
     def drop_table(cls):
-        """Drop the job_applications table."""
+        """Drop the job_applications table, its search index, summary and change log."""
         try:
-            CURSOR.execute("DROP TABLE IF EXISTS job_applications")
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("DROP TABLE IF EXISTS job_search")
+                CURSOR.execute("DROP TABLE IF EXISTS job_bulk_insert")
+                CURSOR.execute("DROP TABLE IF EXISTS job_counts")
+                CURSOR.execute("DROP TABLE IF EXISTS job_changes")
+                CURSOR.execute("DROP TABLE IF EXISTS job_applications")
             print("Table 'job_applications' dropped successfully.")
         except sqlite3.Error as e:
             print(f"An error occurred while dropping the table: {e}")
@@ -159,42 +297,324 @@ class JobApplication:
     @classmethod
     def find_by_id(cls, job_id):
         """Retrieve a job application by ID."""
+        cached = identity_map.get(cls, job_id)
+        if cached:
+            return cached
         try:
             CURSOR.execute("SELECT * FROM job_applications WHERE job_id = ?", (job_id,))
             row = CURSOR.fetchone()
             if row is None:
                 return None
-            return cls(job_title=row[1], company_id=row[2], description=row[3], 
-                   date_applied=row[4], last_follow_up=row[5], status=row[6], id=row[0])
+            return cls.instance_from_db(row)
         except sqlite3.Error as e:
             print(f"An error occurred while retrieving job application ID {job_id}: {e}")
             return None
 
     @classmethod
-    def get_all(cls):
-        """Fetch all job applications."""
+    def get_all(cls, view=False):
+        """Fetch all job applications, as JobApplicationRow views if view is true."""
         try:
+            if view:
+                return fetch_all("SELECT * FROM job_applications", row_factory=JobApplicationRow.row_factory)
             CURSOR.execute("SELECT * FROM job_applications")
             rows = CURSOR.fetchall()
-            return (
-                [
-                    cls(
-                        job_title=row[1],
-                        company_id=row[2],
-                        description=row[3],
-                        date_applied=row[4],
-                        last_follow_up=row[5],
-                        status=row[6],
-                        id=row[0],
-                    )
-                    for row in rows
-                ]
-                if rows
-                else []
-            )
+            return [cls.instance_from_db(row) for row in rows]
         except sqlite3.Error as e:
             return(f"An error occurred while fetching all job applications: {e}")
 
+    @classmethod
+    def iter_all(cls, batch_size=500, status=None, company_id=None, applied_from=None, applied_to=None,
+                 view=False):
+        """Yield job applications lazily, fetching batch_size rows at a time.
+
+        status and company_id narrow the results in SQL, using their indexes.
+        applied_from and applied_to (inclusive dates) select a date_applied
+        range; results then come in date order, read straight off the
+        date_applied index. With view, JobApplicationRow views are yielded
+        instead of models.
+        """
+        conditions, params = [], []
+        order = "job_id"
+        if applied_from is not None or applied_to is not None:
+            conditions.append("date_applied BETWEEN ? AND ?")
+            params += [parse_date(applied_from or date.min), parse_date(applied_to or date.max)]
+            order = "date_applied, job_id"
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if company_id is not None:
+            conditions.append("company_id = ?")
+            params.append(company_id)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT * FROM job_applications{where} ORDER BY {order}"
+        rows = iter_rows(sql, params, batch_size=batch_size,
+                         row_factory=JobApplicationRow.row_factory if view else None)
+        yield from rows if view else map(cls.instance_from_db, rows)
+
+    EXPORT_COLUMNS = ("job_title", "company_id", "description", "date_applied", "last_follow_up", "status")
+
+    @classmethod
+    def export(cls, stream, format="jsonl", details=False, batch_size=1000):
+        """Stream every job application to stream as CSV or JSON lines (see
+        models.export_query).
+
+        With details each row also carries company_name (null for a job with no
+        company) and tags, joined in by the same scan: companies by primary key
+        and tags through the job_tag index, grouped in job_id order so nothing
+        is sorted or looked up per row.
+        Tags are a JSON array, or a ';'-separated cell in CSV.
+        """
+        columns = [("id", "j.job_id")] + [(name, f"j.{name}") for name in cls.EXPORT_COLUMNS]
+        source = "job_applications j ORDER BY j.job_id"
+        if details:
+            tags = ("json_group_array(t.name) FILTER (WHERE t.name IS NOT NULL)" if format == "jsonl"
+                    else "group_concat(t.name, ';')")
+            columns += [("company_name", "c.name"), ("tags", tags)]
+            source = """job_applications j
+                LEFT JOIN companies c ON c.id = j.company_id
+                LEFT JOIN job_application_tags jt ON jt.job_id = j.job_id
+                LEFT JOIN tags t ON t.id = jt.tag_id
+                GROUP BY j.job_id
+                ORDER BY j.job_id"""
+        return export_query(stream, columns, source, format, batch_size)
+
+    @classmethod
+    def search(cls, query, limit=20, mark=("[", "]"), raw=False):
+        """Full-text search over job titles, descriptions and company names.
+
+        Returns up to limit (job, snippet) pairs, best match first by bm25 over
+        all matches. Each word in query must appear, and the last one may be a
+        prefix ("dev" finds "developer"). The snippet is the best-matching
+        passage with matches wrapped in mark. Pass raw=True to use FTS5 query
+        syntax as-is.
+        """
+        match = query if raw else cls.match_expression(query)
+        if not match:
+            return []
+        try:
+            # FTS5 returns rows in rank order itself, so there is no sort and
+            # snippets are only built for the rows within the limit.
+            CURSOR.execute("""
+            SELECT job_applications.*, snippet(job_search, -1, ?, ?, '…', 12)
+            FROM job_search
+            JOIN job_applications ON job_applications.job_id = job_search.rowid
+            WHERE job_search MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """, (mark[0], mark[1], match, limit))
+            return [(cls.instance_from_db(row), row[-1]) for row in CURSOR.fetchall()]
+        except sqlite3.Error as e:
+            print(f"An error occurred while searching job applications: {e}")
+            return []
+
+    @staticmethod
+    def match_expression(text):
+        """Turn free text into an FTS5 query: every word quoted, the last one as a prefix.
+
+        One-letter prefixes aren't indexed and would match most of the table, so
+        a single trailing letter is matched as a whole word.
+        """
+        words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+        if words and len(text.split()[-1]) > 1:
+            words[-1] += "*"
+        return " ".join(words)
+
+    @classmethod
+    def count(cls, status=None, company_id=None):
+        """Number of applications, optionally for one status and/or company.
+
+        Read from the trigger-maintained job_counts table, so it is a single
+        primary-key lookup however many applications there are.
+        """
+        try:
+            CURSOR.execute(
+                "SELECT applications FROM job_counts WHERE company_id = ? AND status = ?",
+                (company_id or 0, status or "")
+            )
+            row = CURSOR.fetchone()
+            return row[0] if row else 0
+        except sqlite3.Error as e:
+            print(f"An error occurred while counting job applications: {e}")
+            return 0
+
+    @classmethod
+    def status_funnel(cls, company_id=None):
+        """Return (status, applications, share of all applications) for each
+        status in FUNNEL order, from the job_counts summary.
+        """
+        try:
+            CURSOR.execute(
+                "SELECT status, applications FROM job_counts WHERE company_id = ?",
+                (company_id or 0,)
+            )
+            counts = dict(CURSOR.fetchall())
+        except sqlite3.Error as e:
+            print(f"An error occurred while building the status funnel: {e}")
+            return []
+        total = counts.get("", 0)
+        return [
+            (status, counts.get(status, 0), counts.get(status, 0) / total if total else 0.0)
+            for status in cls.FUNNEL
+        ]
+
+    @classmethod
+    def rebuild_counts(cls):
+        """Recount the job_counts summary from job_applications."""
+        from models.migrations import rebuild_job_counts
+        try:
+            with transaction():
+                rebuild_job_counts(CURSOR)
+            print("Application counts rebuilt.")
+        except sqlite3.Error as e:
+            print(f"An error occurred while rebuilding application counts: {e}")
+
+    #! follow-ups
+    @classmethod
+    def due_for_follow_up(cls, as_of=None, limit=20, intervals=None, view=False):
+        """Return [(job, due date)] for the applications due a follow-up on as_of
+        (default today), most overdue first, at most limit of them (None for all).
+
+        intervals maps status to days (default FOLLOW_UP_DAYS). Each status is
+        read in last-contact order from the (status, last contact) index, at most
+        limit rows, and the per-status runs are merged on due date with a heap,
+        so the cost follows the size of the answer rather than of the table.
+        """
+        as_of = parse_date(as_of or date.today())
+        intervals = cls.FOLLOW_UP_DAYS if intervals is None else intervals
+        invalid = set(intervals) - cls.VALID_STATUSES
+        if invalid:
+            raise ValueError(f"Invalid status {', '.join(sorted(invalid))}. "
+                             f"Must be one of {', '.join(sorted(cls.VALID_STATUSES))}.")
+        factory = JobApplicationRow.row_factory if view else None
+
+        def due(status, days):
+            # The expression must match idx_job_applications_status_follow_up.
+            rows = iter_rows("""
+                SELECT * FROM job_applications
+                WHERE status = ? AND coalesce(last_follow_up, date_applied) <= ?
+                ORDER BY coalesce(last_follow_up, date_applied), job_id
+                LIMIT ?
+            """, (status, as_of - timedelta(days=days), -1 if limit is None else limit),
+                batch_size=min(limit or 500, 500), row_factory=factory)
+            for row in rows:
+                yield (row[5] or row[4]) + timedelta(days=days), row[0], row
+
+        try:
+            merged = heapq.merge(*(due(status, days) for status, days in intervals.items()))
+            return [(row if view else cls.instance_from_db(row), due_date)
+                    for due_date, _, row in islice(merged, limit)]
+        except sqlite3.Error as e:
+            print(f"An error occurred while finding follow-ups: {e}")
+            return []
+
+    @classmethod
+    def get_page(cls, after_id=0, limit=20, before_id=None, view=False):
+        """Return one page of job applications in job_id order.
+
+        Pages are keyset based: the rows after after_id, or the rows before
+        before_id when it is given, so each page only reads its own rows. With
+        view, the page holds JobApplicationRow views instead of models.
+        """
+        factory = JobApplicationRow.row_factory if view else None
+        try:
+            if before_id is not None:
+                rows = fetch_all(
+                    "SELECT * FROM job_applications WHERE job_id < ? ORDER BY job_id DESC LIMIT ?",
+                    (before_id, limit), factory
+                )[::-1]
+            else:
+                rows = fetch_all(
+                    "SELECT * FROM job_applications WHERE job_id > ? ORDER BY job_id LIMIT ?",
+                    (after_id, limit), factory
+                )
+            return rows if view else [cls.instance_from_db(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"An error occurred while fetching job applications: {e}")
+            return []
+
+    #! multi-tag queries
+    @classmethod
+    def filter_clause(cls, tags_all=(), tags_any=(), tags_none=(), status=None, company_id=None):
+        """Compile tag and field filters into (WHERE clause over job_applications j, params).
+
+        Tags are given by name. Jobs must carry every tag in tags_all, at least
+        one in tags_any and none in tags_none. status is one status or a list of
+        them. The tag conditions become one set of job ids built from the
+        (tag_id, job_id) index: GROUP BY/HAVING for tags_all, INTERSECT for
+        tags_any and EXCEPT for tags_none, so no rows are filtered in Python.
+        An unknown tag in tags_all matches nothing.
+        """
+        def tagged(names):
+            return (f"SELECT job_id FROM job_application_tags WHERE tag_id IN "
+                    f"(SELECT id FROM tags WHERE name IN ({', '.join('?' * len(names))}))")
+
+        tags_all, tags_any, tags_none = (list(dict.fromkeys(tags)) for tags in (tags_all, tags_any, tags_none))
+        sets, set_params = [], []
+        if tags_all:
+            sets.append(f"{tagged(tags_all)} GROUP BY job_id HAVING count(*) = ?")
+            set_params += tags_all + [len(tags_all)]
+        if tags_any:
+            sets.append(tagged(tags_any))
+            set_params += tags_any
+
+        conditions, params = [], []
+        if sets and tags_none:
+            conditions.append(f"j.job_id IN ({' INTERSECT '.join(sets)} EXCEPT {tagged(tags_none)})")
+            params += set_params + tags_none
+        elif sets:
+            conditions.append(f"j.job_id IN ({' INTERSECT '.join(sets)})")
+            params += set_params
+        elif tags_none:
+            conditions.append(f"j.job_id NOT IN ({tagged(tags_none)})")
+            params += tags_none
+
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            invalid = set(statuses) - cls.VALID_STATUSES
+            if invalid:
+                raise ValueError(f"Invalid status {', '.join(sorted(invalid))}. "
+                                 f"Must be one of {', '.join(sorted(cls.VALID_STATUSES))}.")
+            conditions.append(f"j.status IN ({', '.join('?' * len(statuses))})")
+            params += statuses
+        if company_id is not None:
+            conditions.append("j.company_id = ?")
+            params.append(company_id)
+        return " AND ".join(conditions) or "1", params
+
+    @classmethod
+    def filter(cls, tags_all=(), tags_any=(), tags_none=(), status=None, company_id=None,
+               after_id=0, limit=20, before_id=None, view=False):
+        """Return one keyset page (see get_page) of the job applications matching
+        the filters, e.g. filter(tags_all=["remote", "full-time"], tags_none=["contract"]).
+
+        See filter_clause for the filters. Pass limit=None for every match.
+        """
+        where, params = cls.filter_clause(tags_all, tags_any, tags_none, status, company_id)
+        factory = JobApplicationRow.row_factory if view else None
+        limit = -1 if limit is None else limit
+        try:
+            if before_id is not None:
+                rows = fetch_all(f"SELECT j.* FROM job_applications j WHERE {where} AND j.job_id < ? "
+                                 f"ORDER BY j.job_id DESC LIMIT ?", params + [before_id, limit], factory)[::-1]
+            else:
+                rows = fetch_all(f"SELECT j.* FROM job_applications j WHERE {where} AND j.job_id > ? "
+                                 f"ORDER BY j.job_id LIMIT ?", params + [after_id, limit], factory)
+            return rows if view else [cls.instance_from_db(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"An error occurred while filtering job applications: {e}")
+            return []
+
+    @classmethod
+    def iter_filter(cls, tags_all=(), tags_any=(), tags_none=(), status=None, company_id=None,
+                    batch_size=500, view=False):
+        """Yield every job application matching the filters in job_id order,
+        batch_size rows at a time (see filter_clause).
+        """
+        where, params = cls.filter_clause(tags_all, tags_any, tags_none, status, company_id)
+        rows = iter_rows(f"SELECT j.* FROM job_applications j WHERE {where} ORDER BY j.job_id", params,
+                         batch_size=batch_size, row_factory=JobApplicationRow.row_factory if view else None)
+        yield from rows if view else map(cls.instance_from_db, rows)
+
 #use kwargs!!!
     def update(self, **kwargs):
         """Update job application fields dynamically."""
@@ -204,25 +624,90 @@ class JobApplication:
         if not updates:
             raise ValueError("No valid fields provided for update.")
 
+        # Run the values through the property setters first, so they are checked
+        # and normalized (dates to date objects) the same way the constructor does.
+        checked = JobApplication.__new__(JobApplication)
+        for key, value in updates.items():
+            setattr(checked, key, value)
+        updates = {key: getattr(checked, key) for key in updates}
+
         set_clause = ", ".join(f"{key} = ?" for key in updates.keys())
         values = list(updates.values()) + [self.id]
 
         try:
-            CURSOR.execute(f"UPDATE job_applications SET {set_clause} WHERE job_id = ?", values)
-            CONN.commit()
+            with transaction():
+                CURSOR.execute(f"UPDATE job_applications SET {set_clause} WHERE job_id = ?", values)
             
             for key, value in updates.items():
                 setattr(self, key, value)
+            identity_map.add(self)
 
             print(f"Job application ID {self.id} updated successfully.")
         except sqlite3.Error as e:
+            if in_transaction():
+                raise
             print(f"An error occurred while updating job application ID {self.id}: {e}")
 
     def delete(self):
         """Delete a job application."""
         try:
-            CURSOR.execute("DELETE FROM job_applications WHERE job_id = ?", (self.id,))
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("DELETE FROM job_applications WHERE job_id = ?", (self.id,))
+            identity_map.remove(JobApplication, self.id)
+            JobApplicationTag._forget_deleted(job_ids={self.id})
             print(f"Job application ID {self.id} deleted successfully.")
         except sqlite3.Error as e:
-            print(f"An error occurred while deleting job application ID {self.id}: {e}")
\ No newline at end of file
+            if in_transaction():
+                raise
+            print(f"An error occurred while deleting job application ID {self.id}: {e}")
+
+    #! async counterparts for use from an asyncio event loop
+    @classmethod
+    async def afind_by_id(cls, job_id):
+        return await aio.read(cls.find_by_id, job_id)
+
+    @classmethod
+    async def aget_all(cls, view=False):
+        return await aio.read(cls.get_all, view)
+
+    @classmethod
+    async def asearch(cls, query, limit=20, mark=("[", "]"), raw=False):
+        return await aio.read(cls.search, query, limit, mark, raw)
+
+    @classmethod
+    async def acount(cls, status=None, company_id=None):
+        return await aio.read(cls.count, status, company_id)
+
+    @classmethod
+    async def astatus_funnel(cls, company_id=None):
+        return await aio.read(cls.status_funnel, company_id)
+
+    @classmethod
+    async def aget_page(cls, after_id=0, limit=20, before_id=None, view=False):
+        return await aio.read(cls.get_page, after_id, limit, before_id, view)
+
+    @classmethod
+    async def adue_for_follow_up(cls, as_of=None, limit=20, intervals=None, view=False):
+        return await aio.read(cls.due_for_follow_up, as_of, limit, intervals, view)
+
+    @classmethod
+    async def afilter(cls, tags_all=(), tags_any=(), tags_none=(), status=None, company_id=None,
+                      after_id=0, limit=20, before_id=None, view=False):
+        return await aio.read(cls.filter, tags_all, tags_any, tags_none, status, company_id,
+                              after_id, limit, before_id, view)
+
+    async def atags(self):
+        return await aio.read(self.tags)
+
+    async def asave(self):
+        return await aio.write(self.save)
+
+    @classmethod
+    async def asave_many(cls, jobs):
+        return await aio.write(cls.save_many, list(jobs))
+
+    async def aupdate(self, **kwargs):
+        return await aio.write(self.update, **kwargs)
+
+    async def adelete(self):
+        return await aio.write(self.delete)
@@ -1,7 +1,8 @@
 from models.tag import Tag
-from models import CONN, CURSOR
+from models import CURSOR, export_query, in_transaction, iter_rows, insert_many, transaction
+from models import aio
+from models.identity_map import identity_map
 import sqlite3
-import ipdb
 
 
 #! _______ JOIN TABLE ___________
@@ -58,34 +59,76 @@ class JobApplicationTag:
     def create_table(cls):
         """Create the post_tags table."""
         try:
-            CURSOR.execute("""
-            CREATE TABLE IF NOT EXISTS job_application_tags (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_id INTEGER NOT NULL,
-            tag_id INTEGER NOT NULL,
-            FOREIGN KEY (job_id) REFERENCES job_applications(id) ON DELETE CASCADE,
-            FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
-            )
-            """)
+            with transaction():
+                CURSOR.execute("""
+                CREATE TABLE IF NOT EXISTS job_application_tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                tag_id INTEGER NOT NULL,
+                FOREIGN KEY (job_id) REFERENCES job_applications(job_id) ON DELETE CASCADE,
+                FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+                )
+                """)
             print("Table 'job_application_tags' created successfully.")
         except sqlite3.Error as e:
             print(f"An error occurred while creating the table: {e}")
 
+    @classmethod
+    def instance_from_db(cls, row):
+        """Build a job-tag link from a database row without looking the tag up again."""
+        job_tag = cls.__new__(cls)
+        job_tag.id = row[0]
+        job_tag._job_id = row[1]
+        job_tag._tag_id = row[2]
+        return job_tag
+
     def save(self):
         """Save a new post-tag relationship."""
         try:
-            CURSOR.execute("""
-            INSERT INTO job_application_tags (job_id, tag_id)
-            VALUES (?, ?)
-            """, (self.job_id, self.tag_id))
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("""
+                INSERT INTO job_application_tags (job_id, tag_id)
+                VALUES (?, ?)
+                """, (self.job_id, self.tag_id))
             self.id = CURSOR.lastrowid 
+            self._forget_prefetched([self.job_id], [self.tag_id])
             print(f"Post-tag relationship saved successfully with ID {self.id}.")
         except sqlite3.IntegrityError as e:
+            if in_transaction():
+                raise
             print(f"Integrity error occurred while saving post-tag relationship: {e}")
         except sqlite3.Error as e:
+            if in_transaction():
+                raise
             print(f"An error occurred while saving post-tag relationship: {e}")
-        
+
+    @classmethod
+    def save_many(cls, job_tags):
+        """Insert new job-tag links with a single executemany in one transaction,
+        assigning ids back in order. Any failure rolls back the whole batch and
+        is raised.
+        """
+        job_tags = list(job_tags)
+        pairs = set()
+        for job_tag in job_tags:
+            if not isinstance(job_tag, cls):
+                raise TypeError("save_many only accepts JobApplicationTag instances.")
+            if job_tag.id is not None:
+                raise ValueError(f"Job-tag link {job_tag.id} is already saved.")
+            pair = (job_tag.job_id, job_tag.tag_id)
+            if pair in pairs:
+                raise ValueError(f"Tag {job_tag.tag_id} appears twice for job {job_tag.job_id} in the batch.")
+            pairs.add(pair)
+
+        ids = insert_many(
+            "job_application_tags",
+            ("job_id", "tag_id"),
+            ((job_tag.job_id, job_tag.tag_id) for job_tag in job_tags)
+        )
+        for job_tag, id in zip(job_tags, ids):
+            job_tag.id = id
+        cls._forget_prefetched({job_id for job_id, _ in pairs}, {tag_id for _, tag_id in pairs})
+        return job_tags
 
     @classmethod
     def get_all(cls):
@@ -93,19 +136,31 @@ class JobApplicationTag:
         try:
             CURSOR.execute("SELECT * FROM job_application_tags")
             rows = CURSOR.fetchall()
-            return [cls(id=row[0], job_id=row[1], tag_id=row[2]) for row in rows]
+            return [cls.instance_from_db(row) for row in rows]
         except sqlite3.Error as e:
             print(f"An error occurred while retrieving post-tag relationships: {e}")
             return []  # Return an empty list in case of an error
 
     
     
+    @classmethod
+    def iter_all(cls, batch_size=500):
+        """Yield every job application-tag relationship lazily, fetching batch_size rows at a time."""
+        for row in iter_rows("SELECT * FROM job_application_tags", batch_size=batch_size):
+            yield cls.instance_from_db(row)
+
+    @classmethod
+    def export(cls, stream, format="jsonl", batch_size=1000):
+        """Stream every job-tag link to stream as CSV or JSON lines (see models.export_query)."""
+        columns = [(name, name) for name in ("id", "job_id", "tag_id")]
+        return export_query(stream, columns, "job_application_tags ORDER BY id", format, batch_size)
+
     @classmethod
     def drop_table(cls):
         """Drop the job_application_tags table."""
         try:
-            CURSOR.execute("DROP TABLE IF EXISTS job_application_tags")
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("DROP TABLE IF EXISTS job_application_tags")
             print("Table 'job_application_tags' dropped successfully.")
         except sqlite3.Error as e:
             print(f"An error occurred while dropping the table: {e}")
@@ -126,17 +181,70 @@ class JobApplicationTag:
             job_tag.save()
             return job_tag
         except Exception as e:
+            if in_transaction():
+                raise
             print(f"Database error: {e}")
 
     @classmethod
     def delete_tag_from_job(cls, job_id, tag_id):
-        """Removes a tag from a job application."""
+        """Removes a tag from a job application. Returns True if the tag was assigned."""
         try:
-            CURSOR.execute(
-                "DELETE FROM job_application_tags WHERE job_id = ? AND tag_id = ?",
-                (job_id, tag_id)
-            )
-            CONN.commit()
-            print(f"Tag {tag_id} removed from job {job_id}.")
+            with transaction():
+                removed = CURSOR.execute(
+                    "DELETE FROM job_application_tags WHERE job_id = ? AND tag_id = ?",
+                    (job_id, tag_id)
+                ).rowcount > 0
+            cls._forget_prefetched([job_id], [tag_id])
+            if removed:
+                print(f"Tag {tag_id} removed from job {job_id}.")
+            return removed
         except Exception as e:
-            print(f"Error removing tag: {e}")
\ No newline at end of file
+            if in_transaction():
+                raise
+            print(f"Error removing tag: {e}")
+            return False
+
+    @staticmethod
+    def _forget_prefetched(job_ids, tag_ids):
+        """Drop relationship lists cached by prefetch_tags/prefetch_jobs on the
+        live jobs and tags whose links just changed.
+        """
+        from models.job_application import JobApplication
+        for job_id in job_ids:
+            job = identity_map.get(JobApplication, job_id)
+            if job is not None:
+                job._tags = None
+        for tag_id in tag_ids:
+            tag = identity_map.get(Tag, tag_id)
+            if tag is not None:
+                tag._job_applications = None
+
+    @staticmethod
+    def _forget_deleted(job_ids=(), tag_ids=(), company_id=None):
+        """Drop prefetched relationship lists on live objects that still hold rows
+        a cascading delete just removed: tags with deleted jobs (by id, or all of
+        a deleted company's) and jobs with deleted tags.
+        """
+        from models.job_application import JobApplication
+        if tag_ids:
+            for job in identity_map.instances(JobApplication):
+                if any(tag.id in tag_ids for tag in getattr(job, "_tags", None) or ()):
+                    job._tags = None
+        if job_ids or company_id is not None:
+            for tag in identity_map.instances(Tag):
+                jobs = getattr(tag, "_job_applications", None) or ()
+                if any(job.id in job_ids or (company_id is not None and job.company_id == company_id) for job in jobs):
+                    tag._job_applications = None
+
+    #! async counterparts for use from an asyncio event loop
+    @classmethod
+    async def acreate(cls, job_id, tag_id):
+        return await aio.write(cls.create, job_id, tag_id)
+
+    @classmethod
+    async def adelete_tag_from_job(cls, job_id, tag_id):
+        return await aio.write(cls.delete_tag_from_job, job_id, tag_id)
+
+    @classmethod
+    async def aget_all(cls):
+        return await aio.read(cls.get_all)
@@ -0,0 +1,472 @@
+import sqlite3
+
+from models import CONN, pool
+
+
+#! _______ SCHEMA SNAPSHOTS ___________
+# Frozen copies of the table definitions each migration works against. Never edit
+# these once a migration using them has shipped; add a new migration instead.
+
+JOB_APPLICATIONS_V2 = """
+CREATE TABLE {table} (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_title TEXT NOT NULL,
+    company_id INTEGER,
+    description TEXT,
+    date_applied DATE,
+    last_follow_up DATE,
+    status TEXT CHECK(status IN ('applied', 'pending', 'rejected', 'offer')),
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+)
+"""
+
+JOB_APPLICATIONS_V3 = """
+CREATE TABLE {table} (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_title TEXT NOT NULL,
+    company_id INTEGER,
+    description TEXT,
+    date_applied DATE CHECK(date_applied IS NULL OR date(date_applied) IS date_applied),
+    last_follow_up DATE CHECK(last_follow_up IS NULL OR date(last_follow_up) IS last_follow_up),
+    status TEXT CHECK(status IN ('applied', 'pending', 'rejected', 'offer')),
+    FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
+)
+"""
+
+JOB_APPLICATION_TAGS_V2 = """
+CREATE TABLE {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    FOREIGN KEY (job_id) REFERENCES job_applications(job_id) ON DELETE CASCADE,
+    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+)
+"""
+
+
+def table_exists(cursor, name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+
+def rebuild_table(cursor, name, create_sql):
+    """Recreate a table from a new definition without losing its rows.
+
+    SQLite can't ALTER constraints in place, so this follows the documented
+    procedure: create the new table, copy the shared columns, drop the old one,
+    rename, then restore the indexes and triggers that were attached to it.
+    """
+    if not table_exists(cursor, name):
+        cursor.execute(create_sql.format(table=name))
+        return
+
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (name,)
+    )
+    attached = [row[0] for row in cursor.fetchall()]
+
+    new_name = f"{name}_new"
+    cursor.execute(f"DROP TABLE IF EXISTS {new_name}")
+    cursor.execute(create_sql.format(table=new_name))
+    old_columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({name})").fetchall()]
+    new_columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({new_name})").fetchall()]
+    columns = ", ".join(column for column in new_columns if column in old_columns)
+
+    cursor.execute(f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {name}")
+    cursor.execute(f"DROP TABLE {name}")
+    cursor.execute(f"ALTER TABLE {new_name} RENAME TO {name}")
+    for sql in attached:
+        cursor.execute(sql)
+
+
+#! _______ MIGRATIONS ___________
+
+def create_base_schema(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS companies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL CHECK(LENGTH(name) > 0),
+        website TEXT,
+        contact_info TEXT
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        tag_type TEXT CHECK(tag_type IN ('location', 'length')) NOT NULL
+    )
+    """)
+    if not table_exists(cursor, "job_applications"):
+        cursor.execute(JOB_APPLICATIONS_V2.format(table="job_applications"))
+    if not table_exists(cursor, "job_application_tags"):
+        cursor.execute(JOB_APPLICATION_TAGS_V2.format(table="job_application_tags"))
+
+
+def fix_foreign_keys(cursor):
+    """job_applications referenced companies(company_id) and job_application_tags
+    referenced job_applications(id); neither column exists.
+    """
+    rebuild_table(cursor, "job_applications", JOB_APPLICATIONS_V2)
+    rebuild_table(cursor, "job_application_tags", JOB_APPLICATION_TAGS_V2)
+    # Links left behind by deletes that the broken cascade never reached.
+    cursor.execute("""
+    DELETE FROM job_application_tags
+    WHERE job_id NOT IN (SELECT job_id FROM job_applications)
+       OR tag_id NOT IN (SELECT id FROM tags)
+    """)
+
+
+def unique_job_tags(cursor):
+    cursor.execute("""
+    DELETE FROM job_application_tags
+    WHERE id NOT IN (SELECT MIN(id) FROM job_application_tags GROUP BY job_id, tag_id)
+    """)
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_job_application_tags_job_tag
+    ON job_application_tags (job_id, tag_id)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_application_tags_tag_job
+    ON job_application_tags (tag_id, job_id)
+    """)
+
+
+def lookup_indexes(cursor):
+    """Indexes for the company, status and date filters of the listings and for
+    company name lookups.
+
+    They are deliberately not covering. The listings select every column, so a
+    covering index would be a second copy of job_applications (description
+    included): on 300k jobs each such index is as big as the table itself, and
+    writes would grow with every one. That buys 20-40% on a full filtered scan
+    but nothing on the 20-row keyset pages the CLI reads. The tag filters only
+    need ids and already run on the covering (tag_id, job_id) index.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_applications_company ON job_applications (company_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_applications_status ON job_applications (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_applications_date_applied ON job_applications (date_applied)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_companies_name ON companies (name)")
+
+
+def job_search_index(cursor):
+    """FTS5 index over job titles, descriptions and company names.
+
+    job_search keeps its own copy of the text with rowid = job_id, so results can
+    be ranked and snippeted without touching the base tables. Triggers keep it in
+    step with job_applications and with company renames.
+    """
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS job_search USING fts5(
+        job_title, description, company_name,
+        tokenize = 'porter unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """)
+    # Title matches count most, then company, then description.
+    cursor.execute("INSERT INTO job_search (job_search, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS job_search_insert AFTER INSERT ON job_applications BEGIN
+        INSERT INTO job_search (rowid, job_title, description, company_name)
+        VALUES (new.job_id, new.job_title, new.description,
+                (SELECT name FROM companies WHERE id = new.company_id));
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS job_search_update
+    AFTER UPDATE OF job_title, description, company_id ON job_applications BEGIN
+        DELETE FROM job_search WHERE rowid = old.job_id;
+        INSERT INTO job_search (rowid, job_title, description, company_name)
+        VALUES (new.job_id, new.job_title, new.description,
+                (SELECT name FROM companies WHERE id = new.company_id));
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS job_search_delete AFTER DELETE ON job_applications BEGIN
+        DELETE FROM job_search WHERE rowid = old.job_id;
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS job_search_company_rename AFTER UPDATE OF name ON companies BEGIN
+        UPDATE job_search SET company_name = new.name
+        WHERE rowid IN (SELECT job_id FROM job_applications WHERE company_id = new.id);
+    END
+    """)
+
+    cursor.execute("DELETE FROM job_search")
+    cursor.execute("""
+    INSERT INTO job_search (rowid, job_title, description, company_name)
+    SELECT job_applications.job_id, job_applications.job_title, job_applications.description, companies.name
+    FROM job_applications LEFT JOIN companies ON companies.id = job_applications.company_id
+    """)
+    cursor.execute("INSERT INTO job_search (job_search) VALUES ('optimize')")
+
+
+def rebuild_job_counts(cursor):
+    """Recount job_counts from job_applications, with the same rows the triggers keep:
+    (company, status), (company, '') and (0, status) where those are set, and
+    (0, '') over every application.
+    """
+    cursor.execute("DELETE FROM job_counts")
+    cursor.execute("""
+    WITH groups AS MATERIALIZED (
+        SELECT company_id, status, COUNT(*) AS applications FROM job_applications GROUP BY company_id, status
+    )
+    INSERT INTO job_counts (company_id, status, applications)
+    SELECT company_id, status, applications FROM groups WHERE company_id IS NOT NULL AND status IS NOT NULL
+    UNION ALL
+    SELECT company_id, '', SUM(applications) FROM groups WHERE company_id IS NOT NULL GROUP BY company_id
+    UNION ALL
+    SELECT 0, status, SUM(applications) FROM groups WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT 0, '', SUM(applications) FROM groups HAVING COUNT(*) > 0
+    """)
+
+
+# Trigger body that counts new.* into its four job_counts rows.
+JOB_COUNTS_ADD = """
+    INSERT INTO job_counts (company_id, status, applications)
+    SELECT company_id, status, 1 FROM (
+        SELECT new.company_id AS company_id, new.status AS status
+        UNION ALL SELECT new.company_id, ''
+        UNION ALL SELECT 0, new.status
+        UNION ALL SELECT 0, ''
+    )
+    WHERE company_id IS NOT NULL AND status IS NOT NULL
+    ON CONFLICT (company_id, status) DO UPDATE SET applications = applications + 1;
+"""
+
+
+def job_counts_table(cursor):
+    """Application counts per (company, status), kept current by triggers.
+
+    company_id 0 holds the totals across companies and status '' the totals
+    across statuses, so (0, '') is the number of applications. Each insert,
+    delete or move between companies or statuses adjusts those four rows.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_counts (
+        company_id INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        applications INTEGER NOT NULL,
+        PRIMARY KEY (company_id, status)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_counts_status_applications
+    ON job_counts (status, applications DESC, company_id)
+    """)
+
+    old_keys = "(VALUES (old.company_id, old.status), (old.company_id, ''), (0, old.status), (0, ''))"
+    remove = f"""
+        UPDATE job_counts SET applications = applications - 1 WHERE (company_id, status) IN {old_keys};
+        DELETE FROM job_counts WHERE applications <= 0 AND (company_id, status) IN {old_keys};
+    """
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS job_counts_insert AFTER INSERT ON job_applications BEGIN {JOB_COUNTS_ADD} END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS job_counts_delete AFTER DELETE ON job_applications BEGIN {remove} END")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS job_counts_update AFTER UPDATE OF company_id, status ON job_applications
+    WHEN old.company_id IS NOT new.company_id OR old.status IS NOT new.status
+    BEGIN {remove} {JOB_COUNTS_ADD} END
+    """)
+    rebuild_job_counts(cursor)
+
+
+def canonical_dates(cursor):
+    """Rewrite every job date as 'YYYY-MM-DD' text and enforce that with CHECKs.
+
+    Dates used to be stored however they arrived: date objects, unpadded
+    strings like '2025-1-6', or datetimes. If any value can't be read as a date
+    the migration stops and lists those rows, so they can be corrected (or set
+    to NULL) by hand before running it again; nothing is thrown away.
+    """
+    from models import parse_date
+
+    fixes, unreadable = {}, []
+    for column in ("date_applied", "last_follow_up"):
+        # CAST keeps the DATE converter from touching the raw values.
+        cursor.execute(f"""
+        SELECT job_id, CAST({column} AS TEXT) FROM job_applications
+        WHERE {column} IS NOT NULL AND date({column}) IS NOT {column}
+        """)
+        fixes[column] = []
+        for job_id, value in cursor.fetchall():
+            try:
+                fixes[column].append((parse_date(value[:10] if len(value) > 10 and value[10] in " T" else value), job_id))
+            except ValueError:
+                unreadable.append(f"job_id {job_id} {column} {value!r}")
+    if unreadable:
+        shown = "; ".join(unreadable[:20]) + (f"; and {len(unreadable) - 20} more" if len(unreadable) > 20 else "")
+        raise sqlite3.Error(f"{len(unreadable)} job dates are not YYYY-MM-DD dates: {shown}")
+
+    for column, column_fixes in fixes.items():
+        cursor.executemany(f"UPDATE job_applications SET {column} = ? WHERE job_id = ?", column_fixes)
+    rebuild_table(cursor, "job_applications", JOB_APPLICATIONS_V3)
+    # Makes "pending, applied in the last 30 days" one range scan.
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_applications_status_date ON job_applications (status, date_applied)
+    """)
+
+
+
+# Rows kept in job_changes; older entries are trimmed a thousand at a time.
+JOB_CHANGES_KEPT = 100000
+
+
+def job_changes_log(cursor):
+    """Log the ids of job_applications rows that are updated or deleted.
+
+    Readers that cache job rows (models/snapshot.py) pick up inserts by job_id
+    alone, since AUTOINCREMENT ids only grow; this log tells them which older
+    rows to read again. seq is AUTOINCREMENT so it never goes backwards, and a
+    gap before the oldest kept entry means the log was trimmed past a reader.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS job_changes_update
+    AFTER UPDATE OF company_id, date_applied, last_follow_up, status ON job_applications BEGIN
+        INSERT INTO job_changes (job_id) VALUES (new.job_id);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS job_changes_delete AFTER DELETE ON job_applications BEGIN
+        INSERT INTO job_changes (job_id) VALUES (old.job_id);
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS job_changes_trim AFTER INSERT ON job_changes
+    WHEN new.seq % 1000 = 0 BEGIN
+        DELETE FROM job_changes WHERE seq <= new.seq - {JOB_CHANGES_KEPT};
+    END
+    """)
+
+
+def follow_up_index(cursor):
+    """Index job applications by status and the date they were last contacted.
+
+    That is last_follow_up, or date_applied before any follow-up, so
+    "applications at this status not contacted since X" is one range scan in
+    date order (see JobApplication.due_for_follow_up). Queries must spell the
+    expression exactly as coalesce(last_follow_up, date_applied) to use it.
+    """
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_applications_status_follow_up
+    ON job_applications (status, coalesce(last_follow_up, date_applied))
+    """)
+
+
+def company_rename_when_changed(cursor):
+    """Reindex a company's jobs in job_search only when its name really changes.
+
+    Company.update() writes every column, so UPDATE OF name alone fired the
+    trigger (and rewrote all of that company's search rows) on any edit.
+    """
+    cursor.execute("DROP TRIGGER IF EXISTS job_search_company_rename")
+    cursor.execute("""
+    CREATE TRIGGER job_search_company_rename AFTER UPDATE OF name ON companies
+    WHEN old.name IS NOT new.name BEGIN
+        UPDATE job_search SET company_name = new.name
+        WHERE rowid IN (SELECT job_id FROM job_applications WHERE company_id = new.id);
+    END
+    """)
+
+
+def bulk_insert_guard(cursor):
+    """Let JobApplication.bulk_insert index and count a whole batch at once.
+
+    While job_bulk_insert holds a row the insert triggers of job_search and
+    job_counts skip their per-row work, and bulk_insert updates both with one
+    statement for the batch instead. The row only ever exists inside
+    bulk_insert's own write transaction, so other connections never see it.
+    """
+    cursor.execute("CREATE TABLE IF NOT EXISTS job_bulk_insert (active INTEGER)")
+    guard = "WHEN NOT EXISTS (SELECT 1 FROM job_bulk_insert)"
+    cursor.execute("DROP TRIGGER IF EXISTS job_search_insert")
+    cursor.execute(f"""
+    CREATE TRIGGER job_search_insert AFTER INSERT ON job_applications {guard} BEGIN
+        INSERT INTO job_search (rowid, job_title, description, company_name)
+        VALUES (new.job_id, new.job_title, new.description,
+                (SELECT name FROM companies WHERE id = new.company_id));
+    END
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS job_counts_insert")
+    cursor.execute(f"CREATE TRIGGER job_counts_insert AFTER INSERT ON job_applications {guard} "
+                   f"BEGIN {JOB_COUNTS_ADD} END")
+
+# (version, description, apply) in the order they must run. PRAGMA user_version
+# records the last version applied to a database file.
+MIGRATIONS = [
+    (1, "create base schema", create_base_schema),
+    (2, "point foreign keys at existing columns", fix_foreign_keys),
+    (3, "unique (job_id, tag_id) index on job_application_tags", unique_job_tags),
+    (4, "indexes for company, status, date and name lookups", lookup_indexes),
+    (5, "full-text search index over job titles, descriptions and company names", job_search_index),
+    (6, "trigger-maintained application counts per company and status", job_counts_table),
+    (7, "canonical ISO dates on job_applications", canonical_dates),
+    (8, "log of updated and deleted job applications", job_changes_log),
+    (9, "index on status and last contact date for follow-ups", follow_up_index),
+    (10, "reindex company names in job_search only when they change", company_rename_when_changed),
+    (11, "let bulk inserts skip the per-row search and count triggers", bulk_insert_guard),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+#! _______ RUNNER ___________
+
+def schema_version(conn=None):
+    conn = conn or CONN
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def set_schema_version(version, conn=None):
+    conn = conn or CONN
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def migrate(conn=None, target=LATEST_VERSION):
+    """Apply every pending migration up to target, each in its own transaction.
+
+    Returns the list of versions that were applied.
+    """
+    conn = conn or CONN
+    pending = [migration for migration in MIGRATIONS if schema_version(conn) < migration[0] <= target]
+    if not pending:
+        return []
+
+    with pool.write_lock:
+        return _apply(conn, pending)
+
+
+def _apply(conn, pending):
+    if conn.in_transaction:
+        conn.commit()
+    # Rebuilding a table with foreign keys enforced would cascade the DROP into
+    # its children, and renames must not rewrite references in other triggers.
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("PRAGMA legacy_alter_table = ON")
+
+    applied = []
+    try:
+        for version, description, apply in pending:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                apply(cursor)
+                set_schema_version(version, conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                raise sqlite3.Error(f"Migration {version} ({description}) failed: {e}") from e
+            applied.append(version)
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+    return applied
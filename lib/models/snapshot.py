@@ -0,0 +1,305 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import date
+from itertools import compress, islice
+from operator import and_
+
+from models import chunked, fetch_all, iter_rows, parse_date
+from models.job_application import JobApplication
+
+#! _______ COLUMNAR SNAPSHOT ___________
+# Dashboards recount the same few numbers over every application many times a
+# minute. A JobSnapshot keeps just the columns those numbers need in flat
+# arrays (one machine int per row, about 25 bytes a job) and answers filters
+# and group counts by scanning them, with NumPy when it is installed and with
+# Counter/compress over the arrays when it is not. refresh() reads only what
+# changed: rows past the highest job_id loaded, plus the rows the job_changes
+# log (migration 8) says were updated or deleted since the last refresh.
+#
+# A snapshot is not thread-safe; give each thread its own or guard refresh().
+
+STATUSES = JobApplication.FUNNEL
+OTHER_STATUS = len(STATUSES)  # code for a status outside FUNNEL
+NO_DATE = 0  # day numbers are date.toordinal(), which starts at 1
+
+# One SELECT per refresh does the conversions: status to its index in STATUSES
+# and dates to day numbers (julianday of 0001-01-01 is 1721424.5).
+_STATUS_CODE = "CASE status {} ELSE {} END".format(
+    " ".join(f"WHEN '{status}' THEN {code}" for code, status in enumerate(STATUSES)), OTHER_STATUS
+)
+_COLUMNS = f"""job_id, coalesce(company_id, 0), {_STATUS_CODE},
+    coalesce(CAST(julianday(date_applied) - 1721424.5 AS INTEGER), {NO_DATE}),
+    coalesce(CAST(julianday(last_follow_up) - 1721424.5 AS INTEGER), {NO_DATE})"""
+
+# (attribute, array typecode, NumPy dtype) for each column, in _COLUMNS order.
+_LAYOUT = (
+    ("ids", "q", "int64"),
+    ("company_ids", "q", "int64"),
+    ("statuses", "b", "int8"),
+    ("applied", "i", "int32"),
+    ("followed_up", "i", "int32"),
+)
+
+# Above this share of changed rows a full reload is cheaper than patching.
+RELOAD_SHARE = 0.25
+
+_numpy = None
+
+
+def numpy_module():
+    """Return numpy if it can be imported, else None. Imported on first use."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def day_number(value):
+    """A date (or 'YYYY-MM-DD') as the day number the snapshot stores."""
+    return parse_date(value).toordinal()
+
+
+class JobSnapshot:
+    """In-memory columns of job_applications: ids, company_ids, statuses (codes
+    into STATUSES), and applied / followed_up day numbers (NO_DATE if unset).
+
+        snapshot = JobSnapshot.load()
+        snapshot.status_counts(applied_from="2025-01-01")
+        snapshot.refresh()  # later: reads only new and changed rows
+
+    Rows are kept in job_id order. use_numpy=False forces the pure-Python
+    operations even when NumPy is installed.
+    """
+
+    def __init__(self, use_numpy=None):
+        if use_numpy and numpy_module() is None:
+            raise ImportError("use_numpy=True but NumPy is not installed.")
+        self.np = numpy_module() if use_numpy is not False else None
+        self.max_id = 0
+        self.change_seq = None  # last job_changes.seq applied; None until loaded
+        self._clear()
+
+    @classmethod
+    def load(cls, use_numpy=None):
+        """Read every job application into a new snapshot."""
+        snapshot = cls(use_numpy)
+        snapshot.refresh()
+        return snapshot
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _clear(self):
+        for name, typecode, _ in _LAYOUT:
+            setattr(self, name, array(typecode))
+
+    def _append(self, rows):
+        columns = [getattr(self, name) for name, _, _ in _LAYOUT]
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, 5000))
+            if not batch:
+                break
+            for column, values in zip(columns, zip(*batch)):
+                column.extend(values)
+
+    #! refresh
+    def refresh(self):
+        """Bring the snapshot up to date and return what changed:
+        {"added": n, "updated": n, "removed": n, "reloaded": bool}.
+
+        The change marker is read before any rows, so a write that lands during
+        the refresh is either already included or picked up by the next one.
+        """
+        seq, last_job_id = self._markers()
+        changed = None
+        if self.change_seq is not None and last_job_id >= self.max_id:
+            changed = self._changed_ids(seq) if seq != self.change_seq else []
+
+        if changed is None or len(changed) > RELOAD_SHARE * len(self):
+            self._clear()
+            self.max_id = 0
+            self._append(iter_rows(f"SELECT {_COLUMNS} FROM job_applications ORDER BY job_id", batch_size=5000))
+            self.max_id = self.ids[-1] if self.ids else 0
+            self.change_seq = seq
+            return {"added": len(self), "updated": 0, "removed": 0, "reloaded": True}
+
+        updated, removed = self._apply_changes(changed) if changed else (0, 0)
+        before = len(self)
+        self._append(iter_rows(f"SELECT {_COLUMNS} FROM job_applications WHERE job_id > ? ORDER BY job_id",
+                               (self.max_id,), batch_size=5000))
+        if self.ids:
+            self.max_id = max(self.max_id, self.ids[-1])
+        self.change_seq = seq
+        return {"added": len(self) - before, "updated": updated, "removed": removed, "reloaded": False}
+
+    @staticmethod
+    def _markers():
+        """(last job_changes.seq, highest job_id ever assigned), from the AUTOINCREMENT
+        counters. The second going backwards means job_applications was recreated.
+        """
+        counters = dict(fetch_all(
+            "SELECT name, seq FROM sqlite_sequence WHERE name IN ('job_changes', 'job_applications')"
+        ))
+        return counters.get("job_changes", 0), counters.get("job_applications", 0)
+
+    def _changed_ids(self, seq):
+        """The loaded job ids changed after change_seq, or None if the log no
+        longer reaches back that far (or was reset) and a reload is needed.
+        """
+        if seq < self.change_seq:
+            return None
+        oldest = fetch_all("SELECT min(seq) FROM job_changes")[0][0]
+        if oldest is None or oldest > self.change_seq + 1:
+            return None
+        rows = fetch_all("SELECT DISTINCT job_id FROM job_changes WHERE seq > ? AND seq <= ? AND job_id <= ?",
+                         (self.change_seq, seq, self.max_id))
+        return sorted(row[0] for row in rows)
+
+    def _apply_changes(self, job_ids):
+        """Re-read job_ids and overwrite or drop their rows. Returns (updated, removed)."""
+        current = {}
+        for ids in chunked(job_ids):
+            for row in fetch_all(
+                f"SELECT {_COLUMNS} FROM job_applications WHERE job_id IN ({', '.join('?' * len(ids))})", ids
+            ):
+                current[row[0]] = row
+
+        columns = [getattr(self, name) for name, _, _ in _LAYOUT]
+        gone = []
+        updated = 0
+        for job_id in job_ids:
+            position = bisect_left(self.ids, job_id)
+            if position == len(self.ids) or self.ids[position] != job_id:
+                continue
+            row = current.get(job_id)
+            if row is None:
+                gone.append(position)
+                continue
+            for column, value in zip(columns, row):
+                column[position] = value
+            updated += 1
+
+        if gone:
+            keep = array("b", [1]) * len(self.ids)
+            for position in gone:
+                keep[position] = 0
+            for name, typecode, _ in _LAYOUT:
+                setattr(self, name, array(typecode, compress(getattr(self, name), keep)))
+        return updated, len(gone)
+
+    #! filters
+    def mask(self, status=None, company_id=None, applied_from=None, applied_to=None):
+        """Select rows by status (one or a list), company_id (one or a list) and
+        an inclusive date_applied range. Returns None for "every row", else a
+        NumPy bool array or, without NumPy, a list of bools.
+        """
+        tests = []
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            invalid = set(statuses) - set(STATUSES)
+            if invalid:
+                raise ValueError(f"Invalid status {', '.join(sorted(invalid))}. Must be one of {', '.join(STATUSES)}.")
+            tests.append((self.statuses, {STATUSES.index(s) for s in statuses}))
+        if company_id is not None:
+            tests.append((self.company_ids, {company_id} if isinstance(company_id, int) else set(company_id)))
+        if applied_from is not None or applied_to is not None:
+            low = day_number(applied_from) if applied_from is not None else 1
+            high = day_number(applied_to) if applied_to is not None else date.max.toordinal()
+            tests.append((self.applied, range(low, high + 1)))
+        if not tests:
+            return None
+
+        np = self.np
+        result = None
+        for column, wanted in tests:
+            if np is not None:
+                values = self._view(column)
+                if isinstance(wanted, range):
+                    selected = (values >= wanted.start) & (values < wanted.stop)
+                else:
+                    selected = np.isin(values, list(wanted))
+                result = selected if result is None else result & selected
+            else:
+                if isinstance(wanted, range):
+                    selected = [wanted.start <= value < wanted.stop for value in column]
+                else:
+                    selected = [value in wanted for value in column]
+                result = selected if result is None else list(map(and_, result, selected))
+        return result
+
+    def _view(self, column):
+        """A zero-copy NumPy view of one column array."""
+        dtype = next(dtype for name, _, dtype in _LAYOUT if getattr(self, name) is column)
+        return self.np.frombuffer(column, dtype=dtype) if len(column) else self.np.zeros(0, dtype=dtype)
+
+    def _select(self, column, mask):
+        """The values of column at the rows in mask."""
+        if self.np is not None:
+            values = self._view(column)
+            return values if mask is None else values[mask]
+        return column if mask is None else list(compress(column, mask))
+
+    #! aggregates
+    def count(self, **filters):
+        """Number of rows matching the filters (see mask)."""
+        mask = self.mask(**filters)
+        if mask is None:
+            return len(self)
+        return int(mask.sum()) if self.np is not None else sum(mask)
+
+    def job_ids(self, **filters):
+        """The job ids matching the filters, in job_id order."""
+        return [int(job_id) for job_id in self._select(self.ids, self.mask(**filters))]
+
+    def status_counts(self, **filters):
+        """{status: rows} for every status in STATUSES, in funnel order."""
+        statuses = self._select(self.statuses, self.mask(**filters))
+        if self.np is not None:
+            counts = self.np.bincount(statuses, minlength=len(STATUSES) + 1)
+            return {status: int(counts[code]) for code, status in enumerate(STATUSES)}
+        counts = Counter(statuses)
+        return {status: counts[code] for code, status in enumerate(STATUSES)}
+
+    def company_counts(self, limit=None, **filters):
+        """[(company_id, rows)] for companies with matching rows, most rows first
+        (ties by company_id), at most limit of them.
+        """
+        company_ids = self._select(self.company_ids, self.mask(**filters))
+        if self.np is not None:
+            counts = self.np.bincount(company_ids) if len(company_ids) else self.np.zeros(0, dtype="int64")
+            present = self.np.flatnonzero(counts)
+            order = present[self.np.argsort(-counts[present], kind="stable")][:limit]
+            return [(int(company), int(counts[company])) for company in order]
+        counts = sorted(Counter(company_ids).items(), key=lambda item: (-item[1], item[0]))
+        return counts[:limit]
+
+    def follow_up_days(self, **filters):
+        """Days from applying to the last follow-up, over matching rows that have both dates:
+        {"count": n, "mean": days, "median": days, "max": days} (None values if n is 0).
+        """
+        mask = self.mask(**filters)
+        np = self.np
+        if np is not None:
+            applied, followed = self._view(self.applied), self._view(self.followed_up)
+            selected = (followed != NO_DATE) & (applied != NO_DATE)
+            if mask is not None:
+                selected &= mask
+            days = followed[selected].astype("int64") - applied[selected]
+            if not len(days):
+                return {"count": 0, "mean": None, "median": None, "max": None}
+            return {"count": int(len(days)), "mean": float(days.mean()), "median": float(np.median(days)),
+                    "max": int(days.max())}
+
+        rows = zip(self.applied, self.followed_up) if mask is None else compress(zip(self.applied, self.followed_up), mask)
+        days = sorted(followed - applied for applied, followed in rows if followed != NO_DATE and applied != NO_DATE)
+        if not days:
+            return {"count": 0, "mean": None, "median": None, "max": None}
+        middle = len(days) // 2
+        median = days[middle] if len(days) % 2 else (days[middle - 1] + days[middle]) / 2
+        return {"count": len(days), "mean": sum(days) / len(days), "median": float(median), "max": days[-1]}
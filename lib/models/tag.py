@@ -1,6 +1,8 @@
-from models import CONN, CURSOR
+from models import CURSOR, chunked, export_query, fetch_all, in_transaction, iter_rows, insert_many, transaction
+from models import aio
+from models.identity_map import identity_map
+from models.views import TagRow
 import sqlite3
-import ipdb
 from sqlite3 import IntegrityError
 
 
@@ -21,21 +23,47 @@ class Tag:
             """, (self.id,))
             job_app_tags = CURSOR.fetchall()
             return [
-                JobApplicationTag(id=job_app_tag[0], job_id=job_app_tag[1], tag_id=job_app_tag[2])
+                JobApplicationTag.instance_from_db(job_app_tag)
                 for job_app_tag in job_app_tags
             ]
         except Exception as e:
             return(f"Error retrieving job applications for tag {self.id}: {e}")
     
     def job_applications(self):
+        """Return the job applications carrying this tag in a single JOIN query."""
+        prefetched = getattr(self, "_job_applications", None)
+        if prefetched is not None:
+            return prefetched
         try:
-            from models.job_application_tag import JobApplicationTag
-            return [
-                job_app_tag.job_application() for job_app_tag in self.job_application_tags()
-            ]
+            from models.job_application import JobApplication
+            CURSOR.execute("""
+            SELECT job_applications.* FROM job_applications
+            JOIN job_application_tags ON job_application_tags.job_id = job_applications.job_id
+            WHERE job_application_tags.tag_id = ?
+            """, (self.id,))
+            return [JobApplication.instance_from_db(row) for row in CURSOR.fetchall()]
         except Exception as e:
             return(f"Error retrieving job applications for tag {self.id}: {e}")
 
+    @classmethod
+    def prefetch_jobs(cls, tags):
+        """Load the job applications for every tag in tags with one query per
+        900 tags and cache them, so each tag.job_applications() is a memory read.
+        """
+        from models.job_application import JobApplication
+        by_id = {tag.id: tag for tag in tags}
+        for tag in by_id.values():
+            tag._job_applications = []
+        for ids in chunked(by_id):
+            CURSOR.execute(f"""
+            SELECT job_application_tags.tag_id, job_applications.* FROM job_applications
+            JOIN job_application_tags ON job_application_tags.job_id = job_applications.job_id
+            WHERE job_application_tags.tag_id IN ({", ".join("?" * len(ids))})
+            """, ids)
+            for row in CURSOR.fetchall():
+                by_id[row[0]]._job_applications.append(JobApplication.instance_from_db(row[1:]))
+        return tags
+
     @property
     def name(self):
         return self._name
@@ -61,46 +89,96 @@ class Tag:
     def create_table(cls):
         """Create the tags table."""
         try:
-            CURSOR.execute("""
-            CREATE TABLE IF NOT EXISTS tags (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            tag_type TEXT CHECK(tag_type IN ('location', 'length')) NOT NULL
-            )
-            """)
+            with transaction():
+                CURSOR.execute("""
+                CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                tag_type TEXT CHECK(tag_type IN ('location', 'length')) NOT NULL
+                )
+                """)
             print("Table 'tags' created successfully.")
         except sqlite3.Error as e:
             print(f"An error occurred while creating the table: {e}")   
+
+    @classmethod
+    def instance_from_db(cls, row):
+        """Build a Tag from a database row without re-running validation."""
+        tag = identity_map.get(cls, row[0]) or cls.__new__(cls)
+        tag.id = row[0]
+        tag._name = row[1]
+        tag._tag_type = row[2]
+        return identity_map.add(tag)
             
 
     def save(self):
         """Save a new tag to the database."""
         try:
-            CURSOR.execute("INSERT INTO tags (name, tag_type) VALUES (?, ?)", (self.name, self.tag_type))
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("INSERT INTO tags (name, tag_type) VALUES (?, ?)", (self.name, self.tag_type))
             self.id = CURSOR.lastrowid  # Set the object's ID after insertion
+            identity_map.add(self)
             print(f"Tag '{self.name}' saved successfully.")
         except IntegrityError as e:
+            if in_transaction():
+                raise
             print("IntegrityError: {e} - This tag already exists or violates a database constraint.")
         
 
     @classmethod
-    def get_all(cls):
-        """Retrieve all tags from the database."""
+    def save_many(cls, tags):
+        """Insert new tags with a single executemany in one transaction, assigning ids
+        back in order. Any failure rolls back the whole batch and is raised.
+        """
+        tags = list(tags)
+        names = set()
+        for tag in tags:
+            if not isinstance(tag, cls):
+                raise TypeError("save_many only accepts Tag instances.")
+            if tag.id is not None:
+                raise ValueError(f"Tag '{tag.name}' is already saved with ID {tag.id}.")
+            if tag.name in names:
+                raise ValueError(f"Tag '{tag.name}' appears more than once in the batch.")
+            names.add(tag.name)
+
+        ids = insert_many("tags", ("name", "tag_type"), ((tag.name, tag.tag_type) for tag in tags))
+        for tag, id in zip(tags, ids):
+            tag.id = id
+            identity_map.add(tag)
+        return tags
+
+    @classmethod
+    def get_all(cls, view=False):
+        """Retrieve all tags from the database, as TagRow views if view is true."""
         try:
+            if view:
+                return fetch_all("SELECT * FROM tags", row_factory=TagRow.row_factory)
             CURSOR.execute("SELECT * FROM tags")
             rows = CURSOR.fetchall()
-            return [cls(id=row[0], name=row[1], tag_type=row[2]) for row in rows]
+            return [cls.instance_from_db(row) for row in rows]
         except sqlite3.Error as e:
                 print(f"An error occurred while retrieving tags: {e}")
                 return []  # Return an empty list in case of an error
 
+    @classmethod
+    def iter_all(cls, batch_size=500, view=False):
+        """Yield every tag lazily, fetching batch_size rows at a time."""
+        rows = iter_rows("SELECT * FROM tags", batch_size=batch_size,
+                         row_factory=TagRow.row_factory if view else None)
+        yield from rows if view else map(cls.instance_from_db, rows)
+
+    @classmethod
+    def export(cls, stream, format="jsonl", batch_size=1000):
+        """Stream every tag to stream as CSV or JSON lines (see models.export_query)."""
+        columns = [(name, name) for name in ("id", "name", "tag_type")]
+        return export_query(stream, columns, "tags ORDER BY id", format, batch_size)
+
     @classmethod
     def drop_table(cls):
         """Drop the tags table."""
         try:
-            CURSOR.execute("DROP TABLE IF EXISTS tags")
-            CONN.commit()
+            with transaction():
+                CURSOR.execute("DROP TABLE IF EXISTS tags")
             print("Table 'tags' dropped successfully.")
         except sqlite3.Error as e:
             print(f"An error occurred while dropping the table: {e}")
@@ -110,23 +188,52 @@ class Tag:
         """Find a tag by name."""
         CURSOR.execute("SELECT * FROM tags WHERE name = ?", (name,))
         row = CURSOR.fetchone()
-        return cls(id=row[0], name=row[1], tag_type=row[2]) if row else None
+        return cls.instance_from_db(row) if row else None
 
     @classmethod
     def delete(cls, id):
-        """Delete a tag if it's not linked to any jobs."""
+        """Delete a tag if it's not linked to any jobs. Returns True if a tag was deleted."""
+        from models.job_application_tag import JobApplicationTag
         try:
-            CURSOR.execute("DELETE FROM tags WHERE id = ?", (id,))
-            CONN.commit()
-            print(f"Tag {id} deleted.")
+            with transaction():
+                deleted = CURSOR.execute("DELETE FROM tags WHERE id = ?", (id,)).rowcount > 0
+            identity_map.remove(cls, id)
+            JobApplicationTag._forget_deleted(tag_ids={id})
+            if deleted:
+                print(f"Tag {id} deleted.")
+            return deleted
         except sqlite3.Error as e:
+            if in_transaction():
+                raise
             print(f"Error deleting tag: {e}")
+            return False
 
 
     @classmethod
     def find_by_id(cls, id):
         """Find a tag by ID."""
+        cached = identity_map.get(cls, id)
+        if cached:
+            return cached
         CURSOR.execute("SELECT * FROM tags WHERE id = ?", (id,))
         row = CURSOR.fetchone()
-        return cls(id=row[0], name=row[1], tag_type=row[2]) if row else None
+        return cls.instance_from_db(row) if row else None
+
+    #! async counterparts for use from an asyncio event loop
+    @classmethod
+    async def afind_by_id(cls, id):
+        return await aio.read(cls.find_by_id, id)
+
+    @classmethod
+    async def afind_by_name(cls, name):
+        return await aio.read(cls.find_by_name, name)
+
+    @classmethod
+    async def aget_all(cls, view=False):
+        return await aio.read(cls.get_all, view)
+
+    async def ajob_applications(self):
+        return await aio.read(self.job_applications)
 
+    async def asave(self):
+        return await aio.write(self.save)
@@ -0,0 +1,59 @@
+import sys
+from collections import namedtuple
+
+#! _______ READ-ONLY ROW VIEWS ___________
+# Listings only read their rows, so they can skip the model classes: no
+# per-instance __dict__, no setter validation and no identity map entry. Each
+# view is a tuple with named fields (__slots__ is empty), built straight from
+# the sqlite3 row by its row_factory. Call to_model() to get the full object
+# when something needs to change it.
+
+
+class CompanyRow(namedtuple("CompanyRow", "id name website contact_info")):
+    """Read-only view of a companies row."""
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return tuple.__new__(cls, row)
+
+    def to_model(self):
+        """Return the full Company for this row: the live cached object if there
+        is one, otherwise read fresh from the database.
+        """
+        from models.company import Company
+        return Company.find_by_id(self.id)
+
+
+class JobApplicationRow(namedtuple(
+    "JobApplicationRow", "id job_title company_id description date_applied last_follow_up status"
+)):
+    """Read-only view of a job_applications row."""
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        # Dates arrive as date objects shared through the cached DATE converter;
+        # status has four values, so every row shares one interned string.
+        status = row[6]
+        return tuple.__new__(cls, row[:6] + (status and sys.intern(status),))
+
+    def to_model(self):
+        """Return the full JobApplication for this row (see CompanyRow.to_model)."""
+        from models.job_application import JobApplication
+        return JobApplication.find_by_id(self.id)
+
+
+class TagRow(namedtuple("TagRow", "id name tag_type")):
+    """Read-only view of a tags row."""
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        tag_type = row[2]
+        return tuple.__new__(cls, row[:2] + (tag_type and sys.intern(tag_type),))
+
+    def to_model(self):
+        """Return the full Tag for this row (see CompanyRow.to_model)."""
+        from models.tag import Tag
+        return Tag.find_by_id(self.id)
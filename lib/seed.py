@@ -2,19 +2,25 @@ from models.company import Company
 from models.job_application import JobApplication
 from models.tag import Tag
 from models.job_application_tag import JobApplicationTag
-import ipdb
+from models.migrations import migrate, set_schema_version
+from datetime import date, timedelta
+import argparse
+import random
+import time
 
 def create_tables():
     Company.create_table()
     JobApplication.create_table()
     Tag.create_table()
     JobApplicationTag.create_table()
+    migrate()
 
 def drop_tables():
     JobApplicationTag.drop_table()
     JobApplication.drop_table()
     Tag.drop_table()
     Company.drop_table()
+    set_schema_version(0)
 
 def seed_data():
     """Seed the database with sample data."""
@@ -55,33 +61,134 @@ def seed_data():
 
 
 
+# Rough shape of a real job search: most applications never get past "applied".
+STATUS_WEIGHTS = {"applied": 45, "pending": 30, "rejected": 20, "offer": 5}
+LENGTH_TAGS = ["full-time", "part-time", "contract", "internship", "temporary", "freelance"]
+
+
+def generate_data(companies=100, jobs=1000, tags=20, tag_density=2, seed=42,
+                  end_date=date(2025, 3, 1), batch_size=5000):
+    """Fill the database with a reproducible synthetic dataset.
+
+    The same arguments always produce the same rows. Company popularity follows a
+    Zipf-like curve, so a few companies get most of the applications. Every
+    application has a valid status and a last_follow_up after date_applied (or
+    none). Rows are written batch_size at a time through save_many, so memory
+    stays flat however many jobs are requested.
+    """
+    from faker import Faker
+
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    # Companies
+    company_ids = []
+    for start in range(0, companies, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, companies)):
+            name = f"{fake.company()} #{i + 1}"
+            domain = fake.domain_word()
+            batch.append(Company(
+                name=name,
+                website=f"https://{domain}.com",
+                contact_info=f"jobs@{domain}.com"
+            ))
+        company_ids.extend(company.id for company in Company.save_many(batch))
+
+    # Tags: cities for location tags, contract lengths for length tags
+    tag_batch = []
+    for i in range(tags):
+        if i % 2 == 0:
+            tag_batch.append(Tag(name=f"{fake.city()} {i // 2 + 1}", tag_type="location"))
+        else:
+            length = LENGTH_TAGS[(i // 2) % len(LENGTH_TAGS)]
+            suffix = i // (2 * len(LENGTH_TAGS))
+            tag_batch.append(Tag(name=f"{length} {suffix}" if suffix else length, tag_type="length"))
+    tag_ids = [tag.id for tag in Tag.save_many(tag_batch)]
+
+    # Titles and descriptions come from fixed pools: calling Faker per row would
+    # dominate the run time for millions of jobs.
+    titles = [fake.job()[:80] for _ in range(500)]
+    descriptions = [fake.sentence(nb_words=12) for _ in range(2000)]
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+    popularity = [1 / (rank ** 1.1) for rank in range(1, len(company_ids) + 1)]
+
+    links = 0
+    for start in range(0, jobs, batch_size):
+        count = min(batch_size, jobs - start)
+        picked_companies = rng.choices(company_ids, weights=popularity, k=count)
+        picked_statuses = rng.choices(statuses, weights=status_weights, k=count)
+        batch = []
+        for company_id, status in zip(picked_companies, picked_statuses):
+            applied = end_date - timedelta(days=rng.randint(0, 730))
+            follow_up = None
+            if status != "applied" and applied < end_date:
+                follow_up = applied + timedelta(days=rng.randint(1, min(60, (end_date - applied).days)))
+            batch.append(JobApplication(
+                job_title=rng.choice(titles),
+                company_id=company_id,
+                description=rng.choice(descriptions),
+                date_applied=applied,
+                last_follow_up=follow_up,
+                status=status
+            ))
+        JobApplication.save_many(batch)
+
+        if tag_ids and tag_density:
+            job_tags = []
+            for job in batch:
+                k = min(len(tag_ids), rng.randint(0, 2 * tag_density))
+                job_tags.extend(JobApplicationTag(job_id=job.id, tag_id=tag_id) for tag_id in rng.sample(tag_ids, k))
+            JobApplicationTag.save_many(job_tags)
+            links += len(job_tags)
+
+    elapsed = time.perf_counter() - started
+    print(f"Generated {companies} companies, {tags} tags, {jobs} job applications and "
+          f"{links} job tags in {elapsed:.1f}s.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rebuild the database with the sample data, or with a generated dataset of the given size."
+    )
+    parser.add_argument("--companies", type=int, help="number of companies to generate")
+    parser.add_argument("--jobs", type=int, help="number of job applications to generate")
+    parser.add_argument("--tags", type=int, help="number of tags to generate")
+    parser.add_argument("--tag-density", type=int, default=2, help="average tags per job application")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; the same seed gives the same data")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date(2025, 3, 1),
+                        help="latest date_applied (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows written per transaction")
+    return parser.parse_args(argv)
+
+
 def test_data():
     """Test and display the data in the database."""
     # Test: Get all companies
-    companies = Company.get_all()
     print("Companies:")
-    for company in companies:
+    for company in Company.iter_all():
         print(f"ID: {company.id}, Name: {company.name}, Website: {company.website}, Contact: {company.contact_info}")
 
     # Test: Get all job applications
-    job_apps = JobApplication.get_all()
     print("\nJob Applications:")
-    for job in job_apps:
+    for job in JobApplication.iter_all():
         print(f"ID: {job.id}, Job Title: {job.job_title}, Status: {job.status}, Company ID: {job.company_id}")
 
     # Test: Get all tags
-    tags = Tag.get_all()
     print("\nTags:")
-    for tag in tags:
+    for tag in Tag.iter_all():
         print(f"ID: {tag.id}, Name: {tag.name}")
 
     # Test: Get all job application tags
-    job_app_tags = JobApplicationTag.get_all()
     print("\nJob Application Tags:")
-    for tag in job_app_tags:
+    for tag in JobApplicationTag.iter_all():
         print(f"Job Application ID: {tag.job_id}, Tag ID: {tag.tag_id}")
 
 if __name__ == "__main__":
+    args = parse_args()
 
     drop_tables()
     
@@ -89,7 +196,18 @@ if __name__ == "__main__":
     create_tables()
 
     # Seed the database with data
-    seed_data()
+    if args.companies or args.jobs or args.tags:
+        generate_data(
+            companies=args.companies or 100,
+            jobs=args.jobs or 0,
+            tags=args.tags or 0,
+            tag_density=args.tag_density,
+            seed=args.seed,
+            end_date=args.end_date,
+            batch_size=args.batch_size
+        )
+    else:
+        seed_data()
 
     # # Test the data
     # test_data()
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def job(db):
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    job = JobApplication("Engineer", Company("Acme").save().id, None, "2025-01-06", None, "applied")
+    job.save()
+    return job
+
+
+def test_concurrent_saves_and_reads(db):
+    from models import fetch_all
+    from models.company import Company
+
+    async def scenario():
+        first = [Company(f"Company {n}") for n in range(10)]
+        await asyncio.gather(*(company.asave() for company in first))
+        second = [Company(f"Company {n}") for n in range(10, 20)]
+        results = await asyncio.gather(
+            *(company.asave() for company in second), *(Company.afind_by_id(company.id) for company in first)
+        )
+        return first, second, results[len(second):]
+
+    first, second, found = asyncio.run(scenario())
+
+    assert [company.name for company in found] == [company.name for company in first]
+    assert sorted(company.id for company in first + second) == list(range(1, 21))
+    assert fetch_all("SELECT count(*) FROM companies") == [(20,)]
+
+
+def test_readers_drop_objects_a_write_made_stale(job):
+    from models import aio
+    from models.job_application import JobApplication
+
+    def on_every_reader(func, *args):
+        # The barrier holds each call until all reader threads have one.
+        barrier = threading.Barrier(aio.READ_WORKERS)
+
+        def call():
+            barrier.wait(timeout=5)
+            return func(*args)
+        return asyncio.gather(*(aio.read(call) for _ in range(aio.READ_WORKERS)))
+
+    async def scenario():
+        before = await on_every_reader(JobApplication.find_by_id, job.id)
+        await job.aupdate(status="offer")
+        after = await on_every_reader(JobApplication.find_by_id, job.id)
+        return before, after
+
+    before, after = asyncio.run(scenario())
+
+    assert [found.status for found in before] == ["applied"] * aio.READ_WORKERS
+    assert [found.status for found in after] == ["offer"] * aio.READ_WORKERS
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from batch import run_command, run_script
+from cli import CLI, BatchError
+
+
+@pytest.mark.parametrize("words", [
+    ["jobs", "delete", "--job-id", "notanumber"],
+    ["jobs", "delete", "--job-id", "99"],
+    ["companies", "update", "--company-id", "99"],
+    ["tags", "assign", "--job-id", "1", "--tag-id", "1"],
+    ["tags", "delete", "--tag-id", "99"],
+    ["tags", "delete", "--tag-id", "notanumber"],
+    ["tags", "remove", "--job-id", "1", "--tag-id", "1"],
+])
+def test_commands_that_fail_raise(db, words):
+    with pytest.raises(BatchError):
+        run_command(CLI(), words, io.StringIO())
+
+
+def test_script_counts_failed_lines(db):
+    lines = ["companies create --name Acme", "jobs delete --job-id notanumber", "companies list"]
+    stdout = io.StringIO()
+
+    assert run_script(CLI(), lines, stdout) == 1
+    assert '"name": "Acme"' in stdout.getvalue()
+
+
+def test_closed_output_pipe_exits_quietly(db):
+    import os
+    import subprocess
+    import sys
+    from models import database_path
+    from models.company import Company
+
+    for n in range(200):
+        Company(f"Company {n}").save()
+    lib = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "companies", "list"], cwd=lib,
+        env={**os.environ, "JOB_TRACKER_DB": database_path()},
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    process.stdout.close()  # the reader goes away, as `| head` does
+    stderr = process.stderr.read().decode()
+    process.stderr.close()
+
+    assert process.wait() == 1
+    assert stderr == ""
+
+
+def test_tag_remove_and_delete_succeed_for_existing_rows(db):
+    from models.company import Company
+    from models.job_application import JobApplication
+    from models.tag import Tag
+
+    job = JobApplication("Engineer", Company("Acme").save().id, None, "2025-01-06", None, "applied")
+    job.save()
+    tag = Tag(name="remote", tag_type="location")
+    tag.save()
+    job.add_tag(tag.id)
+
+    run_command(CLI(), ["tags", "remove", "--job-id", str(job.id), "--tag-id", str(tag.id)], io.StringIO())
+    run_command(CLI(), ["tags", "delete", "--tag-id", str(tag.id)], io.StringIO())
+    assert Tag.find_by_id(tag.id) is None
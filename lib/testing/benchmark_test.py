@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+LIB = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_benchmark(*args, only="nothing-matches"):
+    return subprocess.run(
+        [sys.executable, "benchmark.py", "--companies", "3", "--jobs", "20", "--tags", "3",
+         "--only", only, *args],
+        cwd=LIB, capture_output=True, text=True,
+    )
+
+
+def count_jobs(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM job_applications").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_refuses_to_regenerate_into_a_database_it_did_not_create(tmp_path):
+    path = str(tmp_path / "real.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE companies (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("INSERT INTO companies (name) VALUES ('Keep me')")
+    conn.commit()
+    conn.close()
+
+    result = run_benchmark("--db", path)
+
+    assert result.returncode != 0
+    assert "--force" in result.stderr
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT name FROM companies").fetchall() == [("Keep me",)]
+    conn.close()
+
+
+def test_regenerates_its_own_database_and_forced_ones(tmp_path):
+    path = str(tmp_path / "bench.db")
+    assert run_benchmark("--db", path).returncode == 0
+    # A second run recognises the dataset it generated.
+    assert run_benchmark("--db", path).returncode == 0
+
+    other = str(tmp_path / "other.db")
+    sqlite3.connect(other).execute("CREATE TABLE notes (body TEXT)").connection.close()
+    assert run_benchmark("--db", other, "--force").returncode == 0
+
+
+def test_small_dataset_runs_every_benchmark_without_running_out_of_jobs(tmp_path):
+    result = run_benchmark("--db", str(tmp_path / "bench.db"), only="")
+    assert result.returncode == 0, result.stderr
+    assert "JobApplicationTag.create" in result.stdout
+
+
+def test_write_benchmarks_leave_the_reused_dataset_unchanged(tmp_path):
+    path = str(tmp_path / "bench.db")
+    assert run_benchmark("--db", path).returncode == 0
+    assert count_jobs(path) == 20
+
+    result = run_benchmark("--db", path, "--reuse", only="save_many")
+    assert result.returncode == 0, result.stderr
+    assert count_jobs(path) == 20
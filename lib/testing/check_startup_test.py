@@ -0,0 +1,10 @@
+import os
+import subprocess
+import sys
+
+LIB = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_main_imports_within_budget_and_without_lazy_modules():
+    result = subprocess.run([sys.executable, "check_startup.py"], cwd=LIB, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
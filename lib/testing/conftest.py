@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh, fully migrated database file for one test."""
+    from models import close, configure, DEFAULT_DB_PATH
+    from models.identity_map import identity_map
+    from models.migrations import migrate
+
+    configure(path=str(tmp_path / "test.db"))
+    identity_map.clear()
+    migrate()
+    yield
+    close()
+    identity_map.clear()
+    configure(path=os.environ.get("JOB_TRACKER_DB") or DEFAULT_DB_PATH)
@@ -0,0 +1,42 @@
+import io
+import json
+
+import pytest
+
+from models import CURSOR, transaction
+
+
+def test_detailed_export_keeps_jobs_without_a_company(db):
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    company = Company("Acme").save()
+    with transaction():
+        CURSOR.executemany(
+            "INSERT INTO job_applications (job_title, company_id, date_applied, status) VALUES (?, ?, ?, ?)",
+            [("Engineer", company.id, "2025-01-06", "applied"), ("Analyst", None, "2025-01-07", "pending")]
+        )
+
+    for format in ("jsonl", "csv"):
+        plain, detailed = io.StringIO(), io.StringIO()
+        assert JobApplication.export(plain, format) == JobApplication.export(detailed, format, details=True) == 2
+
+    stream = io.StringIO()
+    JobApplication.export(stream, "jsonl", details=True)
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(row["job_title"], row["company_name"]) for row in rows] == [("Engineer", "Acme"), ("Analyst", None)]
+
+
+class ClosedPipe(io.StringIO):
+    def write(self, text):
+        raise BrokenPipeError(32, "Broken pipe")
+
+
+def test_export_to_a_closed_pipe_is_not_reported_as_a_failure(db):
+    from batch import run_command
+    from cli import CLI
+    from models.company import Company
+
+    Company("Acme").save()
+    with pytest.raises(BrokenPipeError):
+        run_command(CLI(), ["export", "--path", "-", "--table", "companies"], ClosedPipe())
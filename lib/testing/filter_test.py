@@ -0,0 +1,57 @@
+from itertools import combinations
+
+import pytest
+
+TAGS = ("remote", "full-time", "contract")
+# Every tag name given to a filter, including one no job (or tag row) has.
+NAMES = TAGS + ("unknown",)
+
+
+@pytest.fixture
+def tagged_jobs(db):
+    """One job for every subset of TAGS, alternating status. Returns {job id: (tag names, status)}."""
+    from models.job_application import JobApplication
+    from models.tag import Tag
+
+    tags = {tag.name: tag for tag in Tag.save_many([Tag(name, "length") for name in TAGS])}
+    subsets = [set(subset) for size in range(len(TAGS) + 1) for subset in combinations(TAGS, size)]
+    jobs = JobApplication.save_many([
+        JobApplication(f"Job {n}", None, None, "2025-01-06", None, ("applied", "pending")[n % 2])
+        for n in range(len(subsets))
+    ])
+    for job, subset in zip(jobs, subsets):
+        for name in subset:
+            job.add_tag(tags[name].id)
+    return {job.id: (subset, job.status) for job, subset in zip(jobs, subsets)}
+
+
+def expected(jobs, tags_all=(), tags_any=(), tags_none=(), status=None):
+    return [
+        id for id, (tags, job_status) in sorted(jobs.items())
+        if set(tags_all) <= tags
+        and (not tags_any or tags & set(tags_any))
+        and not tags & set(tags_none)
+        and status in (None, job_status)
+    ]
+
+
+def test_filter_matches_set_arithmetic(tagged_jobs):
+    from models.job_application import JobApplication
+
+    subsets = [()] + [subset for size in (1, 2) for subset in combinations(NAMES, size)]
+    for tags_all in subsets:
+        for tags_any in [(), ("remote",), ("full-time", "contract"), ("unknown",)]:
+            for tags_none in [(), ("contract",), ("remote", "unknown")]:
+                jobs = JobApplication.filter(tags_all, tags_any, tags_none, limit=None)
+                assert [job.id for job in jobs] == expected(tagged_jobs, tags_all, tags_any, tags_none), \
+                    (tags_all, tags_any, tags_none)
+
+
+@pytest.mark.parametrize("status", ["applied", "pending"])
+def test_filter_combines_tags_with_status(tagged_jobs, status):
+    from models.job_application import JobApplication
+
+    jobs = JobApplication.iter_filter(tags_any=["remote"], tags_none=["contract"], status=status, view=True)
+
+    assert [job.id for job in jobs] == expected(tagged_jobs, tags_any=["remote"], tags_none=["contract"],
+                                                status=status)
@@ -0,0 +1,49 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def jobs(db):
+    """300 applications with random statuses and contact dates. Returns their rows."""
+    from models.job_application import JobApplication
+
+    rng = random.Random(7)
+    rows = []
+    for n in range(300):
+        applied = date(2025, 1, 1) + timedelta(days=rng.randrange(60))
+        follow_up = applied + timedelta(days=rng.randrange(20)) if rng.random() < 0.5 else None
+        rows.append((f"Job {n}", applied, follow_up, rng.choice(sorted(JobApplication.VALID_STATUSES))))
+    ids = JobApplication.bulk_insert(("job_title", "date_applied", "last_follow_up", "status"), rows)
+    return list(zip(ids, rows))
+
+
+def brute_force(jobs, as_of, intervals):
+    due = []
+    for id, (_, applied, follow_up, status) in jobs:
+        if status in intervals:
+            due_date = (follow_up or applied) + timedelta(days=intervals[status])
+            if due_date <= as_of:
+                due.append((due_date, id))
+    return sorted(due)
+
+
+@pytest.mark.parametrize("as_of", [date(2025, 1, 1), date(2025, 1, 20), date(2025, 2, 15), date(2025, 6, 1)])
+@pytest.mark.parametrize("limit", [None, 1, 25])
+def test_due_for_follow_up_matches_a_sorted_brute_force(jobs, as_of, limit):
+    from models.job_application import JobApplication
+
+    results = JobApplication.due_for_follow_up(as_of, limit=limit)
+
+    assert [(due_date, job.id) for job, due_date in results] == \
+        brute_force(jobs, as_of, JobApplication.FOLLOW_UP_DAYS)[:limit]
+
+
+def test_due_for_follow_up_uses_the_given_intervals(jobs):
+    from models.job_application import JobApplication
+
+    intervals = {"rejected": 30, "applied": 0}
+    results = JobApplication.due_for_follow_up(date(2025, 2, 1), limit=None, intervals=intervals, view=True)
+
+    assert [(due_date, job.id) for job, due_date in results] == brute_force(jobs, date(2025, 2, 1), intervals)
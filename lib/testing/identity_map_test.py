@@ -0,0 +1,75 @@
+import asyncio
+import sqlite3
+
+from models import database_path
+from models.identity_map import identity_map
+
+
+def rename_elsewhere(company_id, name):
+    # Another connection, as an outside tool or process would use.
+    conn = sqlite3.connect(database_path())
+    conn.execute("UPDATE companies SET name = ? WHERE id = ?", (name, company_id))
+    conn.commit()
+    conn.close()
+
+
+def test_async_reads_see_outside_writes(db):
+    from models.company import Company
+
+    async def scenario():
+        company = Company("Acme")
+        await company.asave()
+        assert (await Company.afind_by_id(company.id)).name == "Acme"
+        rename_elsewhere(company.id, "Acme Labs")
+        return (await Company.afind_by_id(company.id)).name
+
+    assert asyncio.run(scenario()) == "Acme Labs"
+
+
+def test_sync_keeps_the_map_without_outside_writes(db):
+    from models import get_connection
+    from models.company import Company
+
+    identity_map.sync(get_connection())
+    company = Company("Acme").save()
+    identity_map.sync(get_connection())
+    assert Company.find_by_id(company.id) is company
+
+
+def test_each_cli_command_starts_with_an_empty_map(db):
+    import io
+    from batch import run_command
+    from cli import CLI
+    from models.company import Company
+
+    company = Company("Acme").save()
+    rename_elsewhere(company.id, "Acme Labs")
+    stdout = io.StringIO()
+    run_command(CLI(), ["companies", "list"], stdout)
+
+    assert '"name": "Acme Labs"' in stdout.getvalue()
+
+
+def test_other_threads_never_see_objects_from_an_open_transaction(db):
+    from concurrent.futures import ThreadPoolExecutor
+    from models import transaction
+    from models.company import Company
+
+    with ThreadPoolExecutor(max_workers=1) as other_thread:
+        with transaction():
+            company = Company("Acme").save()
+            assert Company.find_by_id(company.id) is company
+            assert other_thread.submit(Company.find_by_id, company.id).result() is None
+        assert other_thread.submit(Company.find_by_id, company.id).result() is not company
+
+
+def test_sync_clears_the_map_for_a_new_connection(db):
+    from models import close, get_connection
+    from models.company import Company
+
+    identity_map.sync(get_connection())
+    company = Company("Acme").save()
+    close()
+    identity_map.sync(get_connection())
+
+    assert Company.find_by_id(company.id) is not company
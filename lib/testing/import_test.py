@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+LIB = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", [
+    "models.snapshot", "models.job_application", "models.company", "models.tag", "models.job_application_tag",
+])
+def test_module_imports_on_its_own(module):
+    # A fresh interpreter, so nothing imported by other tests hides an import cycle.
+    result = subprocess.run([sys.executable, "-c", f"import {module}"], cwd=LIB, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,106 @@
+import csv
+import json
+
+import pytest
+
+from models import fetch_all, parse_date
+
+CSV = """job_title,company,company_id,status,date_applied,last_follow_up,description
+Engineer,Acme,,applied,2025-01-06,,existing company
+Analyst,Globex,,pending,2025-1-7,2025-01-09,new company
+Designer,Globex,,applied,2025-01-08,,second job at the new company
+,Acme,,applied,2025-01-06,,
+Manager,Acme,,hired,2025-01-06,,
+Tester,Acme,,applied,someday,,
+Support,,999,applied,2025-01-06,,
+Writer,Initech,,offer,2025-01-10,2025-01-05,
+Extra,Acme,,applied,2025-01-06,,,surplus
+"""
+
+
+@pytest.fixture
+def applications(db, tmp_path):
+    from models.company import Company
+
+    Company("Acme").save()
+    path = tmp_path / "applications.csv"
+    path.write_text(CSV)
+    return path
+
+
+def read_rejects(path):
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def test_import_creates_missing_companies_and_rejects_bad_rows(applications):
+    import importer
+
+    summary = importer.import_jobs(str(applications))
+
+    assert summary == {"imported": 3, "rejected": 6, "companies_created": 1,
+                       "rejects_file": str(applications.with_name("applications.rejects.csv"))}
+    assert fetch_all("""
+        SELECT j.job_title, c.name, j.date_applied FROM job_applications j JOIN companies c ON c.id = j.company_id
+        ORDER BY j.job_id
+    """) == [("Engineer", "Acme", parse_date("2025-01-06")), ("Analyst", "Globex", parse_date("2025-01-07")),
+             ("Designer", "Globex", parse_date("2025-01-08"))]
+    assert fetch_all("SELECT name FROM companies ORDER BY id") == [("Acme",), ("Globex",)]
+
+    header, rejects = read_rejects(summary["rejects_file"])
+    assert header == CSV.splitlines()[0].split(",") + ["_line", "_reason"]
+    # Rows are rejected while reading, or when their batch resolves companies.
+    assert sorted((int(row["_line"]), row["_reason"]) for row in rejects) == [
+        (5, "job_title is required"),
+        (6, "status 'hired' must be one of: applied, offer, pending, rejected"),
+        (7, "date_applied 'someday' is not a YYYY-MM-DD date"),
+        (8, "company_id 999 does not exist"),
+        (9, "last_follow_up is before date_applied"),
+        (10, "more fields than the header"),
+    ]
+    assert {row["job_title"]: row["status"] for row in rejects}["Manager"] == "hired"
+
+
+def test_import_without_creating_companies_rejects_unknown_names(applications, tmp_path):
+    import importer
+
+    rejects_path = tmp_path / "rejected.csv"
+    summary = importer.import_jobs(str(applications), rejects_path=str(rejects_path), create_companies=False)
+
+    assert (summary["imported"], summary["companies_created"]) == (1, 0)
+    _, rejects = read_rejects(rejects_path)
+    assert [row["_reason"] for row in rejects if row["job_title"] in ("Analyst", "Designer")] == [
+        "company 'Globex' does not exist", "company 'Globex' does not exist"
+    ]
+
+
+def test_jsonl_rejects_keep_unparseable_lines(db, tmp_path):
+    import importer
+
+    path = tmp_path / "applications.jsonl"
+    path.write_text('{"job_title": "Engineer", "company": "Acme", "status": "applied", "date_applied": "2025-01-06"}\n'
+                    '{"job_title": "Analyst",\n'
+                    '["not", "an", "object"]\n')
+
+    summary = importer.import_jobs(str(path))
+
+    assert (summary["imported"], summary["rejected"], summary["companies_created"]) == (1, 2, 1)
+    with open(summary["rejects_file"]) as f:
+        rejects = [json.loads(line) for line in f]
+    assert [(row["_line"], row["_raw"]) for row in rejects] == [(2, '{"job_title": "Analyst",'),
+                                                                (3, '["not", "an", "object"]')]
+    assert rejects[0]["_reason"].startswith("invalid JSON")
+    assert rejects[1]["_reason"] == "not a JSON object"
+
+
+def test_nothing_rejected_writes_no_rejects_file(db, tmp_path):
+    import importer
+
+    path = tmp_path / "applications.csv"
+    path.write_text(CSV.splitlines()[0] + "\n" + CSV.splitlines()[1] + "\n")
+
+    summary = importer.import_jobs(str(path))
+
+    assert (summary["imported"], summary["rejected"], summary["rejects_file"]) == (1, 0, None)
+    assert not (tmp_path / "applications.rejects.csv").exists()
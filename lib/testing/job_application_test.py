@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+from models import fetch_all
+
+
+@pytest.fixture
+def job(db):
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    company = Company("Acme").save()
+    job = JobApplication("Engineer", company.id, None, "2025-01-06", None, "applied")
+    job.save()
+    return job
+
+
+def test_update_normalizes_dates_like_the_constructor(job):
+    job.update(date_applied="2024-1-5", last_follow_up=date(2024, 2, 1))
+
+    assert job.date_applied == date(2024, 1, 5)
+    assert fetch_all("SELECT date_applied, last_follow_up FROM job_applications") == [
+        (date(2024, 1, 5), date(2024, 2, 1))
+    ]
+
+
+def test_update_rejects_invalid_values_before_writing(job):
+    with pytest.raises(ValueError):
+        job.update(status="hired")
+    with pytest.raises(ValueError):
+        job.update(date_applied="someday")
+
+    assert job.status == "applied"
+    assert fetch_all("SELECT status, date_applied FROM job_applications") == [("applied", date(2025, 1, 6))]
+
+
+def test_bulk_insert_indexes_and_counts_the_batch(db):
+    from models.company import Company
+    from models.job_application import JobApplication
+    from models.migrations import rebuild_job_counts
+    from models import CONN
+
+    company = Company("Acme").save()
+    rows = [(f"Engineer {i}", company.id if i % 3 else None, "data pipelines", "2025-01-06", None,
+             ("applied", "pending", "offer")[i % 3]) for i in range(50)]
+    ids = JobApplication.bulk_insert(
+        ("job_title", "company_id", "description", "date_applied", "last_follow_up", "status"), rows
+    )
+
+    assert ids == list(range(1, 51))
+    assert fetch_all("SELECT count(*) FROM job_search WHERE job_search MATCH 'pipelines'") == [(50,)]
+    counts = fetch_all("SELECT * FROM job_counts ORDER BY company_id, status")
+    rebuild_job_counts(CONN.cursor())
+    assert counts == fetch_all("SELECT * FROM job_counts ORDER BY company_id, status")
+    CONN.rollback()
+
+
+def test_bulk_insert_does_not_change_the_schema(db):
+    from models.job_application import JobApplication
+
+    version = fetch_all("PRAGMA schema_version")
+    JobApplication.bulk_insert(("job_title", "status"), [("Engineer", "applied"), ("Analyst", "offer")])
+
+    assert fetch_all("PRAGMA schema_version") == version
+    assert fetch_all("SELECT count(*) FROM job_search") == [(2,)]
+
+
+def test_bulk_insert_failure_keeps_the_triggers(db):
+    import sqlite3
+    from models.job_application import JobApplication
+
+    triggers = fetch_all("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name")
+    with pytest.raises(sqlite3.IntegrityError):
+        JobApplication.bulk_insert(("job_title", "status"), [("Engineer", "applied"), ("Analyst", "hired")])
+
+    assert fetch_all("SELECT count(*) FROM job_applications") == [(0,)]
+    assert fetch_all("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name") == triggers
+    assert fetch_all("SELECT count(*) FROM job_bulk_insert") == [(0,)]
+    JobApplication("Engineer", None, None, "2025-01-06", None, "applied").save()
+    assert fetch_all("SELECT applications FROM job_counts WHERE company_id = 0 AND status = ''") == [(1,)]
+
+
+def test_row_views_share_one_status_string(job):
+    from models.job_application import JobApplication
+
+    JobApplication("Analyst", job.company_id, None, "2025-01-07", None, "applied").save()
+    first, second = JobApplication.get_all(view=True)
+
+    assert first.status == second.status == "applied"
+    assert first.status is second.status
@@ -0,0 +1,54 @@
+import os
+import sqlite3
+from datetime import date
+
+import pytest
+
+from models import CONN, fetch_all
+from models.migrations import migrate, schema_version
+
+
+@pytest.fixture
+def v6(tmp_path):
+    """A database migrated only as far as version 6, before dates were canonical."""
+    from models import close, configure, DEFAULT_DB_PATH
+
+    configure(path=str(tmp_path / "v6.db"))
+    migrate(target=6)
+    yield
+    close()
+    configure(path=os.environ.get("JOB_TRACKER_DB") or DEFAULT_DB_PATH)
+
+
+def add_job(date_applied, last_follow_up=None):
+    CONN.execute("INSERT INTO job_applications (job_title, date_applied, last_follow_up, status) VALUES (?, ?, ?, ?)",
+                 ("Engineer", date_applied, last_follow_up, "applied"))
+    CONN.commit()
+
+
+def test_canonical_dates_rewrites_readable_dates(v6):
+    add_job("2025-1-6", "2025-02-03 10:00:00")
+    migrate()
+
+    assert fetch_all("SELECT date_applied, last_follow_up FROM job_applications") == [
+        (date(2025, 1, 6), date(2025, 2, 3))
+    ]
+
+
+def test_canonical_dates_stops_on_unreadable_dates_without_losing_them(v6):
+    add_job("2025-1-6")
+    add_job("next week")
+
+    with pytest.raises(sqlite3.Error, match=r"job_id 2 date_applied 'next week'"):
+        migrate()
+    assert schema_version() == 6
+    assert fetch_all("SELECT CAST(date_applied AS TEXT) FROM job_applications ORDER BY job_id") == [
+        ("2025-1-6",), ("next week",)
+    ]
+
+    CONN.execute("UPDATE job_applications SET date_applied = '2025-03-01' WHERE job_id = 2")
+    CONN.commit()
+    migrate()
+    assert fetch_all("SELECT date_applied FROM job_applications ORDER BY job_id") == [
+        (date(2025, 1, 6),), (date(2025, 3, 1),)
+    ]
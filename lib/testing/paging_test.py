@@ -0,0 +1,82 @@
+import pytest
+
+
+@pytest.fixture
+def company_ids(db):
+    """Companies 1-8 with id 4 deleted, so pages have to step over a gap."""
+    from models.company import Company
+
+    companies = Company.save_many([Company(f"Company {n}") for n in range(1, 9)])
+    Company.delete(companies[3])
+    return [1, 2, 3, 5, 6, 7, 8]
+
+
+@pytest.fixture
+def job_ids(company_ids):
+    from models.job_application import JobApplication
+
+    jobs = JobApplication.save_many([
+        JobApplication(f"Job {n}", company_ids[0], None, "2025-01-06", None, "applied") for n in range(1, 9)
+    ])
+    jobs[3].delete()
+    return [1, 2, 3, 5, 6, 7, 8]
+
+
+def page_ids(page):
+    return [record.id for record in page]
+
+
+@pytest.mark.parametrize("view", [False, True])
+@pytest.mark.parametrize("model, ids", [("Company", "company_ids"), ("JobApplication", "job_ids")])
+def test_get_page_walks_forward_and_back(request, model, ids, view):
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    get_page = {"Company": Company, "JobApplication": JobApplication}[model].get_page
+    request.getfixturevalue(ids)
+
+    def page(**kwargs):
+        return page_ids(get_page(limit=3, view=view, **kwargs))
+
+    assert page(after_id=0) == [1, 2, 3]
+    assert page(after_id=3) == [5, 6, 7]
+    assert page(after_id=7) == [8]
+    assert page(after_id=8) == []
+    assert page(before_id=8) == [5, 6, 7]
+    assert page(before_id=5) == [1, 2, 3]
+    assert page(before_id=2) == [1]
+    assert page(before_id=1) == []
+
+
+def test_paginate_moves_between_pages_and_stops_at_the_edges(company_ids, monkeypatch, capsys):
+    from functools import partial
+    from cli import CLI
+    from models.company import Company
+
+    cli = CLI()
+    cli.PAGE_SIZE = 3
+    answers = iter(["p", "n", "n", "n", "p", "j 6", "j x", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    rendered = []
+
+    assert cli.paginate(partial(Company.get_page, view=True), lambda page: rendered.append(page_ids(page)))
+    assert rendered == [[1, 2, 3], [5, 6, 7], [8], [5, 6, 7], [6, 7, 8]]
+    assert capsys.readouterr().out.count("No more records in that direction.") == 2
+
+
+def test_paginate_skips_the_prompt_for_a_single_page(company_ids, monkeypatch):
+    from cli import CLI
+    from models.company import Company
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": pytest.fail("prompted for one page"))
+    rendered = []
+
+    assert CLI().paginate(Company.get_page, lambda page: rendered.append(page_ids(page)))
+    assert rendered == [[1, 2, 3, 5, 6, 7, 8]]
+
+
+def test_paginate_reports_an_empty_listing(db):
+    from cli import CLI
+    from models.company import Company
+
+    assert CLI().paginate(Company.get_page, lambda page: pytest.fail("rendered an empty page")) is False
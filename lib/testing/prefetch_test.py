@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.fixture
+def tagged(db):
+    """Two jobs at different companies, both tagged remote and onsite, with tags prefetched both ways."""
+    from models.company import Company
+    from models.job_application import JobApplication
+    from models.tag import Tag
+
+    acme, globex = Company("Acme").save(), Company("Globex").save()
+    jobs = [JobApplication(title, company.id, None, "2025-01-06", None, "applied")
+            for title, company in (("Engineer", acme), ("Analyst", globex))]
+    JobApplication.save_many(jobs)
+    tags = Tag.save_many([Tag("Remote", "location"), Tag("Onsite", "location")])
+    for job in jobs:
+        for tag in tags:
+            job.add_tag(tag.id)
+    JobApplication.prefetch_tags(jobs)
+    Tag.prefetch_jobs(tags)
+    return acme, jobs, tags
+
+
+def test_deleting_a_tag_drops_it_from_prefetched_job_tags(tagged):
+    from models.tag import Tag
+
+    _, jobs, (remote, onsite) = tagged
+    Tag.delete(remote.id)
+
+    assert [[tag.name for tag in job.tags()] for job in jobs] == [["Onsite"], ["Onsite"]]
+
+
+def test_deleting_a_job_drops_it_from_prefetched_tag_jobs(tagged):
+    _, (engineer, analyst), tags = tagged
+    engineer.delete()
+
+    assert [[job.job_title for job in tag.job_applications()] for tag in tags] == [["Analyst"], ["Analyst"]]
+
+
+def test_deleting_a_company_drops_its_jobs_from_prefetched_tag_jobs(tagged):
+    acme, _, tags = tagged
+    acme.delete()
+
+    assert [[job.job_title for job in tag.job_applications()] for tag in tags] == [["Analyst"], ["Analyst"]]
@@ -0,0 +1,35 @@
+from models import CURSOR, transaction
+
+
+def test_search_ranks_every_match(db):
+    from models.job_application import JobApplication
+
+    # The best match is the oldest row, behind many weaker, newer matches.
+    rows = [("Engineer", "engineer engineer engineer")] + [("Analyst", "works with an engineer")] * 50
+    with transaction():
+        CURSOR.executemany(
+            "INSERT INTO job_applications (job_title, description, status) VALUES (?, ?, 'applied')", rows
+        )
+
+    results = JobApplication.search("engineer", limit=1)
+
+    assert [job.id for job, _ in results] == [1]
+
+
+def test_company_rename_reindexes_only_when_the_name_changes(db):
+    from models import CONN
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    company = Company("Acme").save()
+    JobApplication("Engineer", company.id, None, "2025-01-06", None, "applied").save()
+
+    # total_changes counts rows written by triggers too.
+    before = CONN.total_changes
+    company.website = "https://acme.example"
+    company.update()
+    assert CONN.total_changes - before == 1
+
+    company.name = "Acme Labs"
+    company.update()
+    assert [job.id for job, _ in JobApplication.search("labs")] == [1]
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+from models import database_path
+
+
+@pytest.fixture
+def jobs(db):
+    """20 applications at two companies, with a mix of statuses and dates."""
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    acme, globex = Company("Acme").save(), Company("Globex").save()
+    statuses = ("applied", "pending", "rejected", "offer")
+    return JobApplication.save_many([
+        JobApplication(f"Job {n}", (acme, globex)[n % 2].id, None, f"2025-01-{n + 1:02d}",
+                       f"2025-02-{n + 1:02d}" if n % 3 else None, statuses[n % 4])
+        for n in range(20)
+    ])
+
+
+def columns(snapshot):
+    return [list(getattr(snapshot, name)) for name in ("ids", "company_ids", "statuses", "applied", "followed_up")]
+
+
+def assert_matches_a_fresh_load(snapshot):
+    from models.snapshot import JobSnapshot
+    assert columns(snapshot) == columns(JobSnapshot.load(use_numpy=False))
+
+
+def test_refresh_adds_new_rows(jobs):
+    from models.job_application import JobApplication
+    from models.snapshot import JobSnapshot
+
+    snapshot = JobSnapshot.load(use_numpy=False)
+    JobApplication("Job 20", jobs[0].company_id, None, "2025-03-01", None, "applied").save()
+
+    assert snapshot.refresh() == {"added": 1, "updated": 0, "removed": 0, "reloaded": False}
+    assert_matches_a_fresh_load(snapshot)
+    assert snapshot.refresh() == {"added": 0, "updated": 0, "removed": 0, "reloaded": False}
+
+
+def test_refresh_rereads_updated_rows(jobs):
+    from models.snapshot import JobSnapshot
+
+    snapshot = JobSnapshot.load(use_numpy=False)
+    jobs[3].update(status="pending", company_id=jobs[0].company_id, last_follow_up="2025-03-01")
+    # A write from another connection is logged by the same triggers.
+    conn = sqlite3.connect(database_path())
+    conn.execute("UPDATE job_applications SET date_applied = '2024-12-31' WHERE job_id = ?", (jobs[7].id,))
+    conn.commit()
+    conn.close()
+
+    assert snapshot.refresh() == {"added": 0, "updated": 2, "removed": 0, "reloaded": False}
+    assert_matches_a_fresh_load(snapshot)
+    assert snapshot.status_counts()["pending"] == 6
+
+
+def test_refresh_drops_deleted_rows(jobs):
+    from models.snapshot import JobSnapshot
+
+    snapshot = JobSnapshot.load(use_numpy=False)
+    jobs[0].delete()
+    jobs[10].delete()
+
+    assert snapshot.refresh() == {"added": 0, "updated": 0, "removed": 2, "reloaded": False}
+    assert_matches_a_fresh_load(snapshot)
+    assert jobs[0].id not in snapshot.job_ids()
+
+
+def test_refresh_reloads_when_most_rows_changed(jobs):
+    from models.job_application import JobApplication
+    from models.snapshot import JobSnapshot
+
+    snapshot = JobSnapshot.load(use_numpy=False)
+    for job in jobs[:10]:
+        job.update(status="rejected")
+    jobs[19].delete()
+    JobApplication("Job 20", jobs[0].company_id, None, "2025-03-01", None, "offer").save()
+
+    assert snapshot.refresh()["reloaded"] is True
+    assert_matches_a_fresh_load(snapshot)
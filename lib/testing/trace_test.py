@@ -0,0 +1,38 @@
+import pytest
+
+from models import enable_tracing, pool, trace_command, tracer
+
+
+@pytest.fixture
+def tracing(db):
+    enable_tracing()
+    yield tracer
+    tracer.enabled = False
+    pool.reset()
+
+
+def test_bulk_insert_counts_as_one_statement(tracing):
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    company = Company("Acme").save()
+    jobs = [JobApplication(f"Job {i}", company.id, None, "2025-01-06", None, "applied") for i in range(300)]
+    with trace_command("bulk") as trace:
+        JobApplication.save_many(jobs)
+
+    assert trace.repeated(tracer.repeat_limit) == []
+    inserts = [stats[0] for sql, stats in trace.statements.items() if sql.startswith("INSERT INTO job_applications")]
+    assert inserts == [1]
+
+
+def test_lookup_per_row_is_still_reported(tracing):
+    from models.company import Company
+    from models.identity_map import identity_map
+
+    companies = Company.save_many(Company(f"Company {i}") for i in range(20))
+    identity_map.clear()
+    with trace_command("lookups") as trace:
+        for company in companies:
+            Company.find_by_id(company.id)
+
+    assert trace.repeated(tracer.repeat_limit) == [("SELECT * FROM companies WHERE id = ?", 20)]
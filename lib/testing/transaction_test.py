@@ -0,0 +1,42 @@
+import pytest
+
+from models import fetch_all, transaction
+
+
+def test_failure_halfway_rolls_back_the_whole_block(db):
+    from models.company import Company
+    from models.job_application import JobApplication
+
+    company = Company("Acme").save()
+    job = JobApplication("Engineer", company.id, None, "2025-01-06", None, "applied")
+
+    with pytest.raises(ValueError):
+        with transaction():
+            company.add_job_application(job)
+            job.add_tag(999)  # no such tag
+
+    assert fetch_all("SELECT count(*) FROM job_applications") == [(0,)]
+    assert fetch_all("SELECT count(*) FROM job_application_tags") == [(0,)]
+
+
+def test_nested_failure_only_undoes_its_savepoint(db):
+    from models.company import Company
+
+    with transaction():
+        Company("Kept").save()
+        with pytest.raises(Exception):
+            with transaction():
+                Company("Undone").save()
+                Company("").save()
+
+    assert fetch_all("SELECT name FROM companies") == [("Kept",)]
+
+
+def test_errors_are_still_reported_outside_a_block(db, capsys):
+    from models.job_application import JobApplication
+
+    job = JobApplication.__new__(JobApplication)
+    job.id = 1
+    job.add_tag(999)
+
+    assert "Invalid tag_id 999" in capsys.readouterr().out